@@ -0,0 +1,441 @@
+import asyncio
+import itertools
+import json
+import re
+import urllib.parse
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+
+import DemoApp.AsyncDriver as AsyncDriver
+import DemoApp.AsyncPages as AsyncPages
+
+BASE_URL = "http://demo.local/hackathonV2.html"
+DASHBOARD_URL = "http://demo.local/hackathonAppV2.html"
+STUB_LATENCY_SEC = 0.02
+POOL_LIMIT = 4
+
+ROUTE = re.compile(r"^/session(?:/(?P<session>[^/]+))?(?:/element/(?P<element>[^/]+))?(?P<command>/.*)?$")
+SIMPLE_SELECTOR = re.compile(r'^(?P<tag>[a-z0-9]+)?(?:\.(?P<cls>[\w-]+))?(?:\[(?P<attr>\w+)="(?P<value>[^"]*)"\])?$')
+
+
+class StubElement(object):
+
+    def __init__(self, tag, classes="", text="", children=(), **attributes):
+        self.tag = tag
+        self.classes = classes.split()
+        self.text = text
+        self.attributes = attributes
+        self.displayed = True
+        self.parent = None
+        self.children = list(children)
+        for child in self.children:
+            child.parent = self
+
+    def descendants(self):
+        for child in self.children:
+            yield child
+            yield from child.descendants()
+
+    def matches(self, simple_selector):
+        match = SIMPLE_SELECTOR.match(simple_selector)
+        return (not match["tag"] or match["tag"] == self.tag) \
+            and (not match["cls"] or match["cls"] in self.classes) \
+            and (not match["attr"] or self.attributes.get(match["attr"]) == match["value"])
+
+    def select(self, selector):
+        *parents, last = [part.strip() for part in selector.split(">")]
+        for element in self.descendants():
+            if element.matches(last) and self.__has_parents(element, parents):
+                yield element
+
+    @staticmethod
+    def __has_parents(element, parents):
+        for selector in reversed(parents):
+            element = element.parent
+            if element is None or not element.matches(selector):
+                return False
+        return True
+
+
+def login_page():
+    def form_group(label, input_id, placeholder, icon):
+        return StubElement("div", "form-group", children=[
+            StubElement("label", text=label),
+            StubElement("input", "form-control", id=input_id, placeholder=placeholder, value=""),
+            StubElement("div", f"pre-icon os-icon {icon}")])
+
+    return StubElement("html", children=[
+        StubElement("title", text="ACME demo app"),
+        StubElement("div", "logo-w", children=[StubElement("a", href="index.html", children=[
+            StubElement("img", src="img/logo-big.png")])]),
+        StubElement("h4", text="Login Form"),
+        StubElement("div", "alert alert-warning", id="alertEmpty", style="display: none;"),
+        StubElement("form", children=[
+            form_group("Username", "username", "Enter your username", "os-icon-user-male-circle"),
+            form_group("Password", "password", "Enter your password", "os-icon-fingerprint"),
+            StubElement("div", "buttons-w", children=[
+                StubElement("button", text="Log In", id="log-in"),
+                StubElement("label", "form-check-label", text="Remember Me"),
+                StubElement("a", children=[StubElement("img", src="twitter.png")]),
+                StubElement("a", children=[StubElement("img", src="facebook.png")])])])])
+
+
+def dashboard_page(show_ads):
+    def row(status, date, description, category, amount):
+        return StubElement("tr", children=[StubElement("td", text=text)
+                                           for text in (status, date, description, category, amount)])
+
+    def balance(advert=None):
+        images = [StubElement("img", src=f"img/{advert}")] if advert else []
+        return StubElement("div", "balance", children=images)
+
+    adverts = ["flashSale.gif", "flashSale2.gif"] if show_ads else []
+    return StubElement("html", children=[
+        StubElement("title", text="ACME demo app"),
+        StubElement("div", "element-balances", children=[balance(advert) for advert in adverts] + [balance()] * 3),
+        StubElement("a", id="showExpensesChart"),
+        StubElement("canvas", id="canvas"),
+        StubElement("table", id="transactionsTable", children=[
+            StubElement("thead", children=[StubElement("tr", children=[StubElement("th", text="AMOUNT",
+                                                                                   id="amount")])]),
+            StubElement("tbody", children=[
+                row("Complete", "Today", "Starbucks coffee", "Restaurant / Cafe", "+ 1,250.00 USD"),
+                row("Pending", "Jan 19th", "Stripe Payment Processing", "Finance", "- 952.23 USD")])])])
+
+
+class StubSession(object):
+
+    def __init__(self):
+        self.url = None
+        self.document = login_page()
+        self.elements = {}
+        self.ids = itertools.count()
+
+    def reference(self, element):
+        element_id = f"e{next(self.ids)}"
+        self.elements[element_id] = element
+        return {AsyncDriver.ELEMENT_KEY: element_id}
+
+    def submit(self):
+        values = {element.attributes["id"]: element.attributes["value"]
+                  for element in self.document.select("input")}
+        missing = [name for name, value in (("Username", values["username"]), ("Password", values["password"]))
+                   if not value]
+        if missing:
+            text = "Both Username and Password must be present" if len(missing) == 2 \
+                else f"{missing[0]} must be present"
+            self.document.children.append(StubElement("div", "alert alert-warning", text=text, style=""))
+        else:
+            show_ads = "showAd=true" in self.url
+            self.url = DASHBOARD_URL
+            self.document = dashboard_page(show_ads)
+
+
+class StubWebDriver(object):
+    """
+    Just enough of the W3C WebDriver protocol to drive the login page and the dashboard, served over keep-alive
+    HTTP/1.1. Every command takes STUB_LATENCY_SEC to answer, the highest number of requests being served at the same
+    time is recorded to verify that independent commands run in parallel. The next `drop_requests` requests are read
+    and left without a response, the connection is closed instead.
+    """
+
+    def __init__(self):
+        self.sessions = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = []
+        self.drop_requests = 0
+        self.connections = set()
+        self.__server = None
+
+    @property
+    def url(self):
+        host, port = self.__server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def start(self):
+        self.__server = await asyncio.start_server(self.__serve, "127.0.0.1", 0)
+
+    async def stop(self):
+        self.__server.close()
+        await self.__server.wait_closed()
+
+    def close_connections(self):
+        for writer in self.connections:
+            writer.close()
+
+    async def __serve(self, reader, writer):
+        self.connections.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("ascii").split(" ", 2)
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line == b"\r\n":
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests.append((method, path))
+                if self.drop_requests:
+                    self.drop_requests -= 1
+                    break
+
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                await asyncio.sleep(STUB_LATENCY_SEC)
+                status, value = self.__dispatch(method, path, json.loads(body) if body else None)
+                self.in_flight -= 1
+
+                response = json.dumps({"value": value}).encode("utf-8")
+                writer.write(f"HTTP/1.1 {status} OK\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(response)}\r\n\r\n".encode("ascii") + response)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections.discard(writer)
+            writer.close()
+
+    def __dispatch(self, method, path, payload):
+        route = ROUTE.match(path).groupdict()
+        command = route["command"] or ""
+
+        if route["session"] is None:
+            session_id = f"session-{len(self.sessions)}"
+            self.sessions[session_id] = StubSession()
+            return 200, {"sessionId": session_id, "capabilities": payload["capabilities"]["alwaysMatch"]}
+
+        session = self.sessions[route["session"]]
+        if method == "DELETE":
+            del self.sessions[route["session"]]
+            return 200, None
+        if command == "/url":
+            if method == "POST":
+                session.url = payload["url"]
+            return 200, session.url
+        if command == "/title":
+            return 200, next(session.document.select("title")).text
+
+        scope = session.elements[route["element"]] if route["element"] else session.document
+        if command in ("/element", "/elements"):
+            assert payload["using"] == "css selector", "locator strategy not translated to W3C"
+            found = [session.reference(element) for element in scope.select(payload["value"])]
+            if command == "/elements":
+                return 200, found
+            if not found:
+                return 404, {"error": "no such element", "message": f"Unable to locate {payload['value']}"}
+            return 200, found[0]
+
+        if command == "/text":
+            return 200, scope.text
+        if command == "/displayed":
+            return 200, scope.displayed
+        if command.startswith("/property/"):
+            # like in a browser, URL properties are resolved against the address of the document
+            name = command.split("/")[-1]
+            value = scope.attributes.get(name)
+            return 200, urllib.parse.urljoin(session.url, value) if name in ("href", "src") and value else value
+        if command.startswith("/attribute/"):
+            name = command.split("/")[-1]
+            return 200, " ".join(scope.classes) if name == "class" else scope.attributes.get(name)
+        if command == "/clear":
+            scope.attributes["value"] = ""
+            return 200, None
+        if command == "/value":
+            scope.attributes["value"] += payload["text"]
+            return 200, None
+        if command == "/click":
+            if scope.tag == "button":
+                session.submit()
+            return 200, None
+
+        return 404, {"error": "unknown command", "message": f"{method} {path}"}
+
+
+class TestAsyncDriver(object):
+    """
+    The asynchronous driver and page objects are verified against a local stub WebDriver endpoint, therefore these
+    tests need neither a browser nor chromedriver.
+    """
+
+    def setup_method(self):
+        self.__stub = StubWebDriver()
+
+    def __run(self, scenario):
+        async def run():
+            await self.__stub.start()
+            pool = AsyncDriver.ConnectionPool(self.__stub.url, limit=POOL_LIMIT)
+            try:
+                return await scenario(pool)
+            finally:
+                await pool.close()
+                await self.__stub.stop()
+
+        return asyncio.run(run())
+
+    def test_session_and_navigation(self):
+        async def scenario(pool):
+            driver = await AsyncDriver.AsyncWebDriver.start(self.__stub.url, pool=pool)
+            await AsyncPages.AsyncLogin.open(driver, BASE_URL)
+            url, title = await asyncio.gather(driver.current_url(), driver.title())
+            await driver.quit()
+            return url, title
+
+        assert self.__run(scenario) == (BASE_URL, "ACME demo app")
+        assert not self.__stub.sessions
+
+    def test_logo(self):
+        async def scenario(pool):
+            driver = await AsyncDriver.AsyncWebDriver.start(self.__stub.url, pool=pool)
+            page = await AsyncPages.AsyncLogin.open(driver, BASE_URL)
+            return await asyncio.gather(page.logo_image(), page.logo_accessibility_text())
+
+        # absolute URL just like WebElement.get_attribute("src") of selenium, the alt attribute is missing
+        assert self.__run(scenario) == ["http://demo.local/img/logo-big.png", None]
+
+    def test_missing_element(self):
+        async def scenario(pool):
+            driver = await AsyncDriver.AsyncWebDriver.start(self.__stub.url, pool=pool)
+            await driver.find_element("id", "missing")
+
+        with pytest.raises(NoSuchElementException):
+            self.__run(scenario)
+
+    def test_connections_kept_alive(self):
+        async def scenario(pool):
+            driver = await AsyncDriver.AsyncWebDriver.start(self.__stub.url, pool=pool)
+            page = await AsyncPages.AsyncLogin.open(driver, BASE_URL)
+            for _ in range(5):
+                await page.header_text()
+            return pool.connections_opened
+
+        assert self.__run(scenario) == 1
+
+    def test_independent_reads_in_parallel(self):
+        async def scenario(pool):
+            driver = await AsyncDriver.AsyncWebDriver.start(self.__stub.url, pool=pool)
+            page = await AsyncPages.AsyncLogin.open(driver, BASE_URL)
+            fields = await page.form_fields()
+            return await asyncio.gather(*(asyncio.gather(field.label(), field.placeholder_text(), field.has_icon())
+                                          for field in fields))
+
+        assert self.__run(scenario) == [["Username", "Enter your username", True],
+                                        ["Password", "Enter your password", True]]
+        assert 1 < self.__stub.max_in_flight <= POOL_LIMIT
+
+    @pytest.mark.parametrize("user, password, expected",
+                             [("", "", "Both Username and Password must be present"),
+                              (" ", "", "Password must be present"),
+                              ("", " ", "Username must be present")])
+    def test_credentials_missing(self, user, password, expected):
+        async def scenario(pool):
+            driver = await AsyncDriver.AsyncWebDriver.start(self.__stub.url, pool=pool)
+            page = await AsyncPages.AsyncLogin.open(driver, BASE_URL)
+            await page.login(user, password)
+            return await page.alerts()
+
+        assert self.__run(scenario) == [expected]
+
+    def test_many_sessions_on_one_loop(self):
+        async def session(pool, user):
+            driver = await AsyncDriver.AsyncWebDriver.start(self.__stub.url, pool=pool)
+            page = await AsyncPages.AsyncLogin.open(driver, BASE_URL)
+            await page.type_user_name(user)
+            await page.submit()
+            return await page.alerts()
+
+        async def scenario(pool):
+            return await asyncio.gather(*(session(pool, f"user{index}") for index in range(6)))
+
+        assert self.__run(scenario) == [["Password must be present"]] * 6
+        assert len(self.__stub.sessions) == 6
+
+    def test_dashboard(self):
+        async def scenario(pool):
+            driver = await AsyncDriver.AsyncWebDriver.start(self.__stub.url, pool=pool)
+            page = await AsyncPages.AsyncLogin.open(driver, BASE_URL, "?showAd=true")
+            await page.login("user", "password")
+
+            dashboard = AsyncPages.AsyncCustomerDashboard(driver)
+            loaded = await AsyncDriver.wait_until(dashboard.is_loaded, timeout=1)
+            transactions, adverts = await asyncio.gather(dashboard.transactions(), dashboard.adverts())
+            advert_details = await asyncio.gather(*(asyncio.gather(advert.image_url(), advert.is_displayed())
+                                                    for advert in adverts))
+            return loaded, await driver.current_url(), transactions, advert_details
+
+        loaded, url, transactions, advert_details = self.__run(scenario)
+        assert loaded
+        assert url == DASHBOARD_URL
+        assert transactions == [
+            {"status": "Complete", "date": "Today", "description": "Starbucks coffee",
+             "category": "Restaurant / Cafe", "amount": "+ 1,250.00 USD"},
+            {"status": "Pending", "date": "Jan 19th", "description": "Stripe Payment Processing",
+             "category": "Finance", "amount": "- 952.23 USD"}]
+        assert advert_details == [["http://demo.local/img/flashSale.gif", True],
+                                  ["http://demo.local/img/flashSale2.gif", True]]
+
+    def test_dashboard_without_adverts(self):
+        async def scenario(pool):
+            driver = await AsyncDriver.AsyncWebDriver.start(self.__stub.url, pool=pool)
+            page = await AsyncPages.AsyncLogin.open(driver, BASE_URL)
+            dashboard = AsyncPages.AsyncCustomerDashboard(driver)
+            loaded_before_login = await dashboard.is_loaded()
+
+            await page.login("user", "password")
+            return loaded_before_login, await dashboard.is_loaded(), await dashboard.adverts()
+
+        assert self.__run(scenario) == (False, True, [])
+
+    def test_connection_closed_while_idle(self):
+        async def scenario(pool):
+            driver = await AsyncDriver.AsyncWebDriver.start(self.__stub.url, pool=pool)
+            await AsyncPages.AsyncLogin.open(driver, BASE_URL)
+            self.__stub.close_connections()
+            await asyncio.sleep(STUB_LATENCY_SEC)
+            title = await driver.title()
+            return title, pool.connections_opened
+
+        assert self.__run(scenario) == ("ACME demo app", 2)
+
+    def test_idempotent_request_sent_again(self):
+        async def scenario(pool):
+            driver = await AsyncDriver.AsyncWebDriver.start(self.__stub.url, pool=pool)
+            await AsyncPages.AsyncLogin.open(driver, BASE_URL)
+            self.__stub.drop_requests = 1
+            return await driver.title()
+
+        assert self.__run(scenario) == "ACME demo app"
+        assert [method for method, path in self.__stub.requests if path.endswith("/title")] == ["GET", "GET"]
+
+    def test_command_with_side_effects_not_sent_again(self):
+        async def scenario(pool):
+            driver = await AsyncDriver.AsyncWebDriver.start(self.__stub.url, pool=pool)
+            page = await AsyncPages.AsyncLogin.open(driver, BASE_URL)
+            self.__stub.drop_requests = 1
+            await page.submit()
+
+        with pytest.raises(ConnectionError):
+            self.__run(scenario)
+        dropped = self.__stub.requests[-1]
+        assert dropped[0] == "POST" and self.__stub.requests.count(dropped) == 1
+        assert not any(path.endswith("/click") for _, path in self.__stub.requests)
+
+    def test_cancelled_request_closes_connection(self):
+        async def scenario(pool):
+            driver = await AsyncDriver.AsyncWebDriver.start(self.__stub.url, pool=pool)
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(driver.title(), timeout=STUB_LATENCY_SEC / 2)
+            await asyncio.sleep(STUB_LATENCY_SEC * 2)
+            connections = len(self.__stub.connections)
+            # the late response of the cancelled command must not be read as the answer of the next one
+            url = await driver.current_url()
+            return connections, url, pool.connections_opened
+
+        assert self.__run(scenario) == (0, None, 2)
@@ -0,0 +1,112 @@
+import pytest
+
+import DemoApp.Audit as Audit
+import DemoApp.Pages as Pages
+
+
+def record(tag, scopes=(), in_link=False, displayed=True, **fields):
+    """
+    Element record in the format returned by AUDIT_SCRIPT, with the tag specific fields defaulting to a compliant
+    element.
+    """
+    defaults = {"img": {"src": "img/logo.png", "alt": "logo", "natural_width": 10, "natural_height": 10},
+                "a": {"href": "#", "label": "", "image_alt": ""},
+                "input": {"type": "text", "name": None, "placeholder": None, "label": "Username"},
+                "label": {"for_id": "", "has_control": False}}[tag]
+
+    element = {"tag": tag, "id": "", "classes": [], "scopes": list(scopes), "in_link": in_link,
+               "displayed": displayed, "width": 10 if displayed else 0, "height": 10 if displayed else 0, "text": ""}
+    element.update(defaults)
+    element.update(fields)
+    return element
+
+
+class StubDriver(object):
+
+    def __init__(self, records):
+        self.records = records
+        self.scripts = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+        return self.records
+
+
+def login_page_records():
+    return [
+        record("img", [Pages.LOGO_CLASS, "auth-box-w"], in_link=True, src="img/logo-big.png", alt=None),
+        record("a", [Pages.LOGO_CLASS], href="index.html", image_alt=""),
+        record("input", ["form-group"], id="username", label="Username"),
+        record("input", ["form-group"], id="password", label=""),
+        record("input", ["form-group"], displayed=False, id="hiddenTracking", label=""),
+        record("input", ["form-group"], type="hidden", id="token", label=""),
+        record("label", ["form-group"], text="Remember Me", for_id="remember", has_control=False),
+        record("label", ["form-group"], text="Username", for_id="username", has_control=True),
+        record("a", [Pages.BUTTONS_SECTION_CLASS], href="#", image_alt="Twitter"),
+        record("img", [Pages.BUTTONS_SECTION_CLASS], in_link=True, src="img/social-icons/twitter.png", alt="Twitter"),
+        record("a", [Pages.BUTTONS_SECTION_CLASS], href="#"),
+        record("img", [Pages.BUTTONS_SECTION_CLASS], in_link=True, src="img/social-icons/facebook.png", alt=""),
+        record("img", [Pages.BUTTONS_SECTION_CLASS], src="img/decoration.png", alt=None),
+    ]
+
+
+@pytest.fixture
+def audit():
+    return Audit.PageAudit(StubDriver(login_page_records()))
+
+
+class TestPageAudit(object):
+
+    def test_single_script(self):
+        driver = StubDriver(login_page_records())
+
+        Audit.PageAudit(driver)
+
+        assert driver.scripts == [Audit.AUDIT_SCRIPT]
+
+    def test_missing_alt(self, audit):
+        sources = [finding.element["src"] for finding in audit.findings(Audit.MISSING_ALT)]
+
+        assert sources == ["img/logo-big.png", "img/social-icons/facebook.png", "img/decoration.png"]
+
+    def test_empty_link(self, audit):
+        findings = audit.findings(Audit.EMPTY_LINK)
+
+        # the logo and the Facebook links have neither text nor an image with alternative text, Twitter has one
+        assert [finding.element["href"] for finding in findings] == ["index.html", "#"]
+        assert findings[1].element["scopes"] == [Pages.BUTTONS_SECTION_CLASS]
+
+    def test_unlabeled_input(self, audit):
+        findings = audit.findings(Audit.UNLABELED_INPUT)
+
+        # inputs not displayed and of ignored types (e.g. hidden) do not need a label
+        assert [finding.element["id"] for finding in findings] == ["password"]
+        assert findings[0].message == "Input 'password' has no label"
+
+    def test_orphan_label(self, audit):
+        findings = audit.findings(Audit.ORPHAN_LABEL)
+
+        assert [finding.element["text"] for finding in findings] == ["Remember Me"]
+        assert findings[0].message == "Label 'Remember Me' refers to missing 'remember'"
+
+    def test_logo_filter(self, audit):
+        assert [image["src"] for image in audit.images(scope=Pages.LOGO_CLASS)] == ["img/logo-big.png"]
+        assert audit.findings(Audit.MISSING_ALT, scope=Pages.LOGO_CLASS)[0].element["src"] == "img/logo-big.png"
+
+    def test_social_icon_filter(self, audit):
+        icons = audit.images(scope=Pages.BUTTONS_SECTION_CLASS, in_link=True)
+        findings = audit.findings(Audit.MISSING_ALT, scope=Pages.BUTTONS_SECTION_CLASS, in_link=True)
+
+        assert [icon["src"] for icon in icons] == ["img/social-icons/twitter.png", "img/social-icons/facebook.png"]
+        assert [finding.element["src"] for finding in findings] == ["img/social-icons/facebook.png"]
+        assert audit.report(Audit.MISSING_ALT, scope=Pages.BUTTONS_SECTION_CLASS, in_link=True) == \
+            "missing-alt: Image img/social-icons/facebook.png has no alternative text"
+
+    def test_displayed_filter(self, audit):
+        assert [element["id"] for element in audit.inputs() if not element["displayed"]] == ["hiddenTracking"]
+        assert [element["id"] for element in audit.elements("input", displayed=False)] == ["hiddenTracking"]
+        assert len(audit.elements("input", displayed=True)) == 3
+
+    def test_scope_without_elements(self, audit):
+        assert audit.images(scope="missing-scope") == []
+        assert audit.report(scope="missing-scope") == ""
@@ -0,0 +1,331 @@
+import asyncio
+import base64
+import json
+import time
+import urllib.parse
+
+from selenium.common.exceptions import JavascriptException, NoSuchElementException, \
+    StaleElementReferenceException, TimeoutException, WebDriverException
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+
+DEFAULT_POOL_LIMIT = 8
+DEFAULT_POLL_SEC = 0.1
+ELEMENT_KEY = "element-6066-11e4-a4ad-f7c4e8b1f7b5"
+HTTP_HEADER_END = b"\r\n"
+# attributes selenium's getAttribute atom resolves through the DOM property, i.e. to absolute URLs
+PROPERTY_ATTRIBUTES = ("href", "src")
+# requests which can safely be sent again when the connection turned out to be closed before any response
+IDEMPOTENT_METHODS = ("GET", "DELETE")
+
+ERRORS = {"no such element": NoSuchElementException,
+          "stale element reference": StaleElementReferenceException,
+          "javascript error": JavascriptException,
+          "timeout": TimeoutException,
+          "script timeout": TimeoutException}
+
+
+def chrome_capabilities(headless=False, window_size=None):
+    arguments = []
+    if headless:
+        arguments.append("--headless")
+    if window_size:
+        arguments.append("--window-size={},{}".format(*window_size))
+
+    return {"browserName": "chrome", "goog:chromeOptions": {"args": arguments}}
+
+
+def start_chromedriver(executable_path="chromedriver"):
+    """
+    Starts a local chromedriver the same way selenium does for webdriver.Chrome(). A single service can serve any
+    number of concurrent sessions, its service_url is the endpoint for AsyncWebDriver.start.
+    """
+    service = Service(executable_path)
+    service.start()
+    return service
+
+
+def _w3c_locator(by, value):
+    """
+    W3C WebDriver only knows css selector, link text, partial link text, tag name and xpath strategies, the rest is
+    translated to css selectors just like selenium does.
+    """
+    if by == By.ID:
+        return By.CSS_SELECTOR, f'[id="{value}"]'
+    if by == By.CLASS_NAME:
+        return By.CSS_SELECTOR, f".{value}"
+    if by == By.NAME:
+        return By.CSS_SELECTOR, f'[name="{value}"]'
+    return by, value
+
+
+class ConnectionClosedError(ConnectionResetError):
+    """
+    The connection was closed before a single byte of the response was received.
+    """
+
+
+class ConnectionPool(object):
+    """
+    Minimal HTTP/1.1 client for a WebDriver endpoint on top of asyncio streams. Every connection carries one request at
+    a time, concurrent requests run in parallel on separate connections which are kept alive and reused afterwards.
+    At most `limit` requests are in flight at the same time. A pool can be shared by all sessions of the same endpoint.
+    """
+
+    def __init__(self, url, limit=DEFAULT_POOL_LIMIT):
+        parsed = urllib.parse.urlsplit(url)
+        self.__host = parsed.hostname
+        self.__port = parsed.port or 80
+        self.__base_path = parsed.path.rstrip("/")
+        self.__limit = asyncio.Semaphore(limit)
+        self.__idle = []
+        self.__connections_opened = 0
+
+    @property
+    def connections_opened(self):
+        return self.__connections_opened
+
+    async def request(self, method, path, payload=None):
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+
+        async with self.__limit:
+            connection, reused = await self.__connection()
+            try:
+                try:
+                    status, response, keep_alive = await self.__exchange(connection, method, path, body)
+                except ConnectionClosedError:
+                    # the server closed the idle keep-alive connection in the meantime, a command with side effects
+                    # might have been executed nevertheless, therefore only idempotent ones are sent again
+                    if not reused or method not in IDEMPOTENT_METHODS:
+                        raise
+                    connection[1].close()
+                    connection = await self.__open()
+                    status, response, keep_alive = await self.__exchange(connection, method, path, body)
+            except BaseException:
+                # cancelled, failed or malformed exchange: the connection is in an unknown state and can not be reused
+                connection[1].close()
+                raise
+
+            if keep_alive:
+                self.__idle.append(connection)
+            else:
+                connection[1].close()
+
+        return status, json.loads(response.decode("utf-8")) if response else None
+
+    async def close(self):
+        while self.__idle:
+            _, writer = self.__idle.pop()
+            writer.close()
+            await writer.wait_closed()
+
+    async def __connection(self):
+        """
+        :return: (connection, whether it is a reused keep-alive connection)
+        """
+        while self.__idle:
+            connection = self.__idle.pop()
+            if not connection[0].at_eof():
+                return connection, True
+            # closed by the server while idle
+            connection[1].close()
+        return await self.__open(), False
+
+    async def __open(self):
+        self.__connections_opened += 1
+        return await asyncio.open_connection(self.__host, self.__port)
+
+    async def __exchange(self, connection, method, path, body):
+        reader, writer = connection
+        head = f"{method} {self.__base_path}{path} HTTP/1.1\r\n" \
+               f"Host: {self.__host}:{self.__port}\r\n" \
+               f"Connection: keep-alive\r\n" \
+               f"Content-Type: application/json;charset=UTF-8\r\n" \
+               f"Content-Length: {len(body)}\r\n\r\n"
+        try:
+            writer.write(head.encode("ascii") + body)
+            await writer.drain()
+            status_line = await reader.readline()
+        except ConnectionError as error:
+            raise ConnectionClosedError("Connection closed by the WebDriver endpoint") from error
+        if not status_line:
+            raise ConnectionClosedError("Connection closed by the WebDriver endpoint")
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (HTTP_HEADER_END, b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = headers.get("connection", "").lower() != "close"
+        if "content-length" in headers:
+            response = await reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            response = await self.__read_chunked(reader)
+        else:
+            response = await reader.read()
+            keep_alive = False
+
+        return status, response, keep_alive
+
+    @staticmethod
+    async def __read_chunked(reader):
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                await reader.readline()
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+
+
+class AsyncWebElement(object):
+
+    def __init__(self, driver, element_id):
+        self.__driver = driver
+        self.__id = element_id
+
+    @property
+    def id(self):
+        return self.__id
+
+    def _execute(self, method, command, payload=None):
+        return self.__driver._execute(method, f"/element/{self.__id}{command}", payload)
+
+    async def find_element(self, by, value):
+        return await self.__driver._find("element", by, value, f"/element/{self.__id}")
+
+    async def find_elements(self, by, value):
+        return await self.__driver._find("elements", by, value, f"/element/{self.__id}")
+
+    async def text(self):
+        return await self._execute("GET", "/text")
+
+    async def get_attribute(self, name):
+        """
+        Same value as WebElement.get_attribute of selenium for the attributes the page objects read: href and src are
+        resolved to absolute URLs, anything else is the plain attribute.
+        """
+        if name in PROPERTY_ATTRIBUTES:
+            value = await self.get_property(name)
+            if value is not None:
+                return value
+        return await self._execute("GET", f"/attribute/{urllib.parse.quote(name)}")
+
+    async def get_property(self, name):
+        return await self._execute("GET", f"/property/{urllib.parse.quote(name)}")
+
+    async def is_displayed(self):
+        return await self._execute("GET", "/displayed")
+
+    async def click(self):
+        await self._execute("POST", "/click", {})
+
+    async def clear(self):
+        await self._execute("POST", "/clear", {})
+
+    async def send_keys(self, value):
+        await self._execute("POST", "/value", {"text": value, "value": list(value)})
+
+
+class AsyncWebDriver(object):
+    """
+    asyncio based WebDriver client speaking the W3C protocol. Commands are plain coroutines, independent commands
+    can be issued concurrently (e.g. with asyncio.gather) and run in parallel on the keep-alive connections of the pool.
+    Errors are raised as the same selenium exceptions the synchronous page objects handle.
+    """
+
+    def __init__(self, pool, session_id):
+        self.__pool = pool
+        self.__session_id = session_id
+
+    @classmethod
+    async def start(cls, url, capabilities=None, pool=None):
+        pool = pool or ConnectionPool(url)
+        capabilities = capabilities or chrome_capabilities()
+        status, response = await pool.request("POST", "/session", {"capabilities": {"alwaysMatch": capabilities},
+                                                                  "desiredCapabilities": capabilities})
+        value = cls._value(status, response)
+        return cls(pool, value.get("sessionId") or response.get("sessionId"))
+
+    @property
+    def session_id(self):
+        return self.__session_id
+
+    @staticmethod
+    def _value(status, response):
+        value = response.get("value") if response else None
+        if status >= 400 or (isinstance(value, dict) and "error" in value):
+            error = value.get("error", "") if isinstance(value, dict) else ""
+            message = value.get("message", "") if isinstance(value, dict) else ""
+            raise ERRORS.get(error, WebDriverException)(message or f"{error} (HTTP {status})")
+        return value
+
+    def _wrap(self, value):
+        if isinstance(value, list):
+            return [self._wrap(item) for item in value]
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return AsyncWebElement(self, value[ELEMENT_KEY])
+            return {key: self._wrap(item) for key, item in value.items()}
+        return value
+
+    def _unwrap(self, value):
+        if isinstance(value, AsyncWebElement):
+            return {ELEMENT_KEY: value.id}
+        if isinstance(value, (list, tuple)):
+            return [self._unwrap(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._unwrap(item) for key, item in value.items()}
+        return value
+
+    async def _execute(self, method, command, payload=None):
+        status, response = await self.__pool.request(method, f"/session/{self.__session_id}{command}", payload)
+        return self._value(status, response)
+
+    async def _find(self, kind, by, value, scope=""):
+        using, value = _w3c_locator(by, value)
+        return self._wrap(await self._execute("POST", f"{scope}/{kind}", {"using": using, "value": value}))
+
+    async def get(self, url):
+        await self._execute("POST", "/url", {"url": url})
+
+    async def title(self):
+        return await self._execute("GET", "/title")
+
+    async def current_url(self):
+        return await self._execute("GET", "/url")
+
+    async def find_element(self, by, value):
+        return await self._find("element", by, value)
+
+    async def find_elements(self, by, value):
+        return await self._find("elements", by, value)
+
+    async def execute_script(self, script, *args):
+        return self._wrap(await self._execute("POST", "/execute/sync", {"script": script,
+                                                                        "args": self._unwrap(args)}))
+
+    async def get_screenshot_as_png(self):
+        return base64.b64decode(await self._execute("GET", "/screenshot"))
+
+    async def quit(self):
+        await self._execute("DELETE", "")
+
+
+async def wait_until(condition, timeout, poll=DEFAULT_POLL_SEC):
+    """
+    asyncio counterpart of WebDriverWait.until: awaits condition() until it returns a truthy value.
+    """
+    end_time = time.monotonic() + timeout
+    while True:
+        value = await condition()
+        if value:
+            return value
+        if time.monotonic() > end_time:
+            raise TimeoutException(f"Condition not met within {timeout} seconds")
+        await asyncio.sleep(poll)
@@ -0,0 +1,107 @@
+import asyncio
+
+from selenium.common.exceptions import NoSuchElementException
+
+import DemoApp.PageItems as PageItems
+
+
+class AsyncFormGroup(object):
+
+    def __init__(self, scope):
+        self.__scope = scope
+
+    def _label_element(self):
+        return self.__scope.find_element(*PageItems.LABEL_LOCATOR)
+
+    def _input_element(self):
+        return self.__scope.find_element(*PageItems.INPUT_LOCATOR)
+
+    def _icon_element(self):
+        return self.__scope.find_element(*PageItems.ICON_LOCATOR)
+
+    async def label(self):
+        return await (await self._label_element()).text()
+
+    async def placeholder_text(self):
+        return await (await self._input_element()).get_attribute("placeholder")
+
+    async def input_id(self):
+        return await (await self._input_element()).get_attribute("id")
+
+    async def has_icon(self):
+        try:
+            return await (await self._icon_element()).is_displayed()
+        except NoSuchElementException:
+            return False
+
+    async def icon_class(self):
+        return (await (await self._icon_element()).get_attribute("class")).split()[-1]
+
+    async def type(self, value):
+        element = await self._input_element()
+        await element.clear()
+        await element.send_keys(value)
+
+
+class AsyncButtons(object):
+
+    def __init__(self, scope):
+        self.__scope = scope
+
+    def _submit_button(self):
+        return self.__scope.find_element(*PageItems.SUBMIT_LOGIN_LOCATOR)
+
+    def _remember_checkbox(self):
+        return self.__scope.find_element(*PageItems.REMEMBER_CHECKBOX_LOCATOR)
+
+    async def submit_button_text(self):
+        return await (await self._submit_button()).text()
+
+    async def checkbox_text(self):
+        return await (await self._remember_checkbox()).text()
+
+    async def social_icons(self):
+        elements = await self.__scope.find_elements(*PageItems.SOCIAL_ICON_LOCATOR)
+        return [AsyncSocialIcon(element) for element in elements]
+
+    async def press_submit_button(self):
+        await (await self._submit_button()).click()
+
+
+class AsyncSocialIcon(object):
+
+    def __init__(self, element):
+        self.__element = element
+
+    async def image_url(self):
+        return await self.__element.get_attribute("src")
+
+    async def accessibility_text(self):
+        return await self.__element.get_attribute("alt")
+
+
+class AsyncTransactionRow(object):
+
+    def __init__(self, scope):
+        self.__scope = scope
+
+    async def data(self):
+        elements = await self.__scope.find_elements(*PageItems.TABLE_DATA_LOCATOR)
+        values = await asyncio.gather(*(element.text() for element in elements[:len(PageItems.TRANSACTION_COLUMNS)]))
+        return dict(zip(PageItems.TRANSACTION_COLUMNS, values))
+
+
+class AsyncAdvert(object):
+
+    def __init__(self, scope, image_element):
+        self._scope = scope
+        self.__image_element = image_element
+
+    async def image_url(self):
+        return await self.__image_element.get_attribute("src")
+
+    async def is_displayed(self):
+        try:
+            return await self.__image_element.is_displayed()
+        except NoSuchElementException:
+            return False
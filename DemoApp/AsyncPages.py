@@ -0,0 +1,127 @@
+import asyncio
+
+from selenium.common.exceptions import NoSuchElementException
+
+import DemoApp.AsyncPageItems as AsyncPageItems
+import DemoApp.PageItems as PageItems
+import DemoApp.Pages as Pages
+
+
+class AsyncPageWithHeader(object):
+    """
+    Page objects in this module mirror DemoApp.Pages on top of DemoApp.AsyncDriver. Every public method is a
+    coroutine, reads that do not depend on each other are issued concurrently.
+    """
+
+    def __init__(self, driver):
+        self._driver = driver
+
+    async def _logo_image_element(self):
+        logo = await self._driver.find_element(*Pages.LOGO_LOCATOR)
+        return await logo.find_element(*Pages.IMAGE_LOCATOR)
+
+    async def logo_image(self):
+        return await (await self._logo_image_element()).get_attribute("src")
+
+    async def logo_accessibility_text(self):
+        return await (await self._logo_image_element()).get_attribute("alt")
+
+    async def header_text(self):
+        return await (await self._driver.find_element(*Pages.HEADER_TEXT_LOCATOR)).text()
+
+
+class AsyncLogin(AsyncPageWithHeader):
+
+    @classmethod
+    async def open(cls, driver, base_url, query_string=""):
+        await driver.get(base_url + query_string)
+        return cls(driver)
+
+    async def _alert(self, element):
+        alert_id, displayed, style = await asyncio.gather(element.get_attribute("id"),
+                                                          element.is_displayed(),
+                                                          element.get_attribute("style"))
+
+        if alert_id != Pages.EMPTY_ALERT_ID and displayed and Pages.STYLE_HIDDEN not in (style or ""):
+            return await element.text()
+        return None
+
+    async def _form_field(self, id):
+        fields = await self.form_fields()
+        input_ids = await asyncio.gather(*(field.input_id() for field in fields))
+        return next(field for field, input_id in zip(fields, input_ids) if input_id == id)
+
+    async def alerts(self):
+        elements = await self._driver.find_elements(*Pages.ALERT_LOCATOR)
+        texts = await asyncio.gather(*(self._alert(element) for element in elements))
+        return [text for text in texts if text is not None]
+
+    async def form_fields(self):
+        form = await self._driver.find_element(*Pages.LOGIN_FORM_LOCATOR)
+        elements = await form.find_elements(*Pages.FORM_GROUP_LOCATOR)
+        return [AsyncPageItems.AsyncFormGroup(element) for element in elements]
+
+    async def buttons(self):
+        return AsyncPageItems.AsyncButtons(await self._driver.find_element(*Pages.BUTTONS_SECTION_LOCATOR))
+
+    async def type_user_name(self, value):
+        await (await self._form_field("username")).type(value)
+
+    async def type_password(self, value):
+        await (await self._form_field("password")).type(value)
+
+    async def login(self, user, password):
+        # both fields are resolved with a single pass over the form groups and filled in concurrently
+        fields = await self.form_fields()
+        input_ids = await asyncio.gather(*(field.input_id() for field in fields))
+        fields_by_id = dict(zip(input_ids, fields))
+
+        await asyncio.gather(fields_by_id["username"].type(user), fields_by_id["password"].type(password))
+        await self.submit()
+
+    async def submit(self):
+        await (await self.buttons()).press_submit_button()
+
+
+class AsyncCustomerDashboard(object):
+
+    def __init__(self, driver):
+        self._driver = driver
+
+    def _transactions_table(self):
+        return self._driver.find_element(*Pages.TRANSACTIONS_LOCATOR)
+
+    async def _amounts_header_element(self):
+        return await (await self._transactions_table()).find_element(*Pages.AMOUNTS_HEADER_LOCATOR)
+
+    async def _advert(self, element):
+        images = await element.find_elements(*PageItems.IMAGE_LOCATOR)
+        return AsyncPageItems.AsyncAdvert(element, images[0]) if images else None
+
+    async def transactions(self):
+        rows = await (await self._transactions_table()).find_elements(*Pages.TABLE_ROW_LOCATOR)
+        return list(await asyncio.gather(*(AsyncPageItems.AsyncTransactionRow(row).data() for row in rows)))
+
+    async def adverts(self):
+        elements = await self._driver.find_elements(*Pages.BALANCE_LOCATOR)
+        adverts = await asyncio.gather(*(self._advert(element) for element in elements))
+        return [advert for advert in adverts if advert is not None]
+
+    async def order_by_amount(self):
+        await (await self._amounts_header_element()).click()
+
+    async def view_expense_chart(self):
+        await (await self._driver.find_element(*Pages.COMPARE_EXPENSES_LOCATOR)).click()
+
+    async def include_another_year(self):
+        await (await self._driver.find_element(*Pages.SHOW_NEXT_YEAR_LOCATOR)).click()
+
+    async def download_canvas(self):
+        canvas = await self._driver.find_element(*Pages.CANVAS_LOCATOR)
+        return await self._driver.execute_script("return arguments[0].toDataURL('image/png')", canvas)
+
+    async def is_loaded(self):
+        try:
+            return await (await self._amounts_header_element()).is_displayed()
+        except NoSuchElementException:
+            return False
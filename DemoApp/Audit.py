@@ -0,0 +1,161 @@
+import collections
+
+MISSING_ALT = "missing-alt"
+EMPTY_LINK = "empty-link"
+UNLABELED_INPUT = "unlabeled-input"
+ORPHAN_LABEL = "orphan-label"
+
+UNLABELED_INPUT_TYPES_IGNORED = ["hidden", "submit", "reset", "button", "image"]
+
+AUDIT_SCRIPT = """
+function text(value) {
+    return value ? value.replace(/\\s+/g, ' ').trim() : '';
+}
+
+function scopes(element) {
+    var classes = [];
+    for (var parent = element.parentElement; parent; parent = parent.parentElement) {
+        for (var i = 0; i < parent.classList.length; i++) {
+            classes.push(parent.classList[i]);
+        }
+    }
+    return classes;
+}
+
+function labelText(element) {
+    var parts = [];
+    if (element.labels) {
+        for (var i = 0; i < element.labels.length; i++) {
+            parts.push(text(element.labels[i].textContent));
+        }
+    }
+    parts.push(text(element.getAttribute('aria-label')));
+    var labelledBy = element.getAttribute('aria-labelledby');
+    if (labelledBy) {
+        labelledBy.split(/\\s+/).forEach(function (id) {
+            var target = document.getElementById(id);
+            if (target) {
+                parts.push(text(target.textContent));
+            }
+        });
+    }
+    return parts.filter(Boolean).join(' ');
+}
+
+var records = [];
+var nodes = document.querySelectorAll('img, a, input, label');
+for (var i = 0; i < nodes.length; i++) {
+    var element = nodes[i];
+    var rect = element.getBoundingClientRect();
+    var tag = element.tagName.toLowerCase();
+    var record = {
+        tag: tag,
+        id: element.id,
+        classes: Array.prototype.slice.call(element.classList),
+        scopes: scopes(element),
+        in_link: tag !== 'a' && element.closest('a') !== null,
+        displayed: rect.width > 0 && rect.height > 0,
+        width: rect.width,
+        height: rect.height,
+        text: text(element.textContent)
+    };
+
+    if (tag === 'img') {
+        record.src = element.currentSrc || element.src;
+        record.alt = element.getAttribute('alt');
+        record.natural_width = element.naturalWidth;
+        record.natural_height = element.naturalHeight;
+    } else if (tag === 'a') {
+        record.href = element.getAttribute('href');
+        record.label = labelText(element);
+        record.image_alt = Array.prototype.map.call(element.querySelectorAll('img'), function (image) {
+            return text(image.getAttribute('alt'));
+        }).join(' ').trim();
+    } else if (tag === 'input') {
+        record.type = (element.getAttribute('type') || 'text').toLowerCase();
+        record.name = element.getAttribute('name');
+        record.placeholder = element.getAttribute('placeholder');
+        record.label = labelText(element);
+    } else if (tag === 'label') {
+        record.for_id = element.htmlFor;
+        record.has_control = element.control !== null;
+    }
+
+    records.push(record);
+}
+return records;
+"""
+
+Finding = collections.namedtuple("Finding", ["kind", "element", "message"])
+
+
+class PageAudit(object):
+    """
+    Collects the accessibility and asset related attributes of every image, anchor, input and label of the page in a
+    single injected script. Elements are kept as plain dictionaries, all checks and filtering work on this in-memory
+    snapshot without further round trips to the browser.
+    """
+
+    def __init__(self, driver):
+        self.__elements = driver.execute_script(AUDIT_SCRIPT)
+        self.__findings = list(self._findings())
+
+    def _findings(self):
+        for element in self.__elements:
+            tag = element["tag"]
+
+            if tag == "img" and not (element["alt"] or "").strip():
+                yield Finding(MISSING_ALT, element, f"Image {element['src']} has no alternative text")
+
+            elif tag == "a" and not (element["text"] or element["label"] or element["image_alt"]):
+                yield Finding(EMPTY_LINK, element, f"Link to {element['href']} has no accessible text")
+
+            elif tag == "input" and self._is_unlabeled_input(element):
+                yield Finding(UNLABELED_INPUT, element, f"Input '{element['id'] or element['name']}' has no label")
+
+            elif tag == "label" and element["for_id"] and not element["has_control"]:
+                yield Finding(ORPHAN_LABEL, element,
+                              f"Label '{element['text']}' refers to missing '{element['for_id']}'")
+
+    @staticmethod
+    def _is_unlabeled_input(element):
+        # inputs which are not rendered (e.g. display: none) can not be filled in by the user, a label is not needed
+        return element["displayed"] \
+            and element["type"] not in UNLABELED_INPUT_TYPES_IGNORED \
+            and not element["label"]
+
+    @staticmethod
+    def _matches(element, tag=None, scope=None, in_link=None, displayed=None):
+        return (tag is None or element["tag"] == tag) \
+            and (scope is None or scope in element["scopes"]) \
+            and (in_link is None or element["in_link"] == in_link) \
+            and (displayed is None or element["displayed"] == displayed)
+
+    def elements(self, tag=None, scope=None, in_link=None, displayed=None):
+        """
+        :param tag: lower case tag name of the elements
+        :param scope: class name of any ancestor of the elements
+        :param in_link: whether the elements should (or should not) be placed inside an anchor
+        :param displayed: whether the elements should (or should not) be rendered with a non-empty size
+        """
+        return [element for element in self.__elements if self._matches(element, tag, scope, in_link, displayed)]
+
+    def images(self, scope=None, in_link=None, displayed=None):
+        return self.elements("img", scope, in_link, displayed)
+
+    def anchors(self, scope=None):
+        return self.elements("a", scope)
+
+    def inputs(self, scope=None):
+        return self.elements("input", scope)
+
+    def labels(self, scope=None):
+        return self.elements("label", scope)
+
+    def findings(self, kind=None, scope=None, in_link=None):
+        return [finding for finding in self.__findings
+                if (kind is None or finding.kind == kind)
+                and self._matches(finding.element, scope=scope, in_link=in_link)]
+
+    def report(self, kind=None, scope=None, in_link=None):
+        return "\n".join(f"{finding.kind}: {finding.message}" for finding in self.findings(kind, scope, in_link))
@@ -0,0 +1,14 @@
+import configparser
+import functools
+
+CONFIG_FILE = "config.ini"
+
+
+@functools.lru_cache(maxsize=None)
+def load(path=CONFIG_FILE):
+    """
+    Parses the configuration file once per process, every test class shares the same ConfigParser instance.
+    """
+    config = configparser.ConfigParser()
+    config.read(path)
+    return config
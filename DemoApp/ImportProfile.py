@@ -0,0 +1,66 @@
+"""
+Import-time profile of the test entry points, based on the output of `python -X importtime`.
+
+    python -m DemoApp.ImportProfile TraditionalTests VisualAITests
+    python -m DemoApp.ImportProfile --collect TraditionalTests.py
+
+The first form imports the given modules, the second one runs `pytest --collect-only` on the given files. The report
+lists the total import time and the slowest imports up to the given nesting depth with their cumulative time.
+"""
+import argparse
+import re
+import subprocess
+import sys
+
+DEFAULT_TOP = 15
+DEFAULT_DEPTH = 1
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \|(?P<indent>\s+)(?P<name>\S+)$")
+
+
+def profile(arguments):
+    """
+    Runs a fresh interpreter with -X importtime, so modules already imported by the caller do not hide any cost.
+    :return: list of (module name, nesting level, self time in us, cumulative time in us) in import order
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime"] + arguments,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+
+    records = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            level = (len(match["indent"]) - 1) // 2
+            records.append((match["name"], level, int(match["self"]), int(match["cumulative"])))
+    return records
+
+
+def report(records, top=DEFAULT_TOP, depth=DEFAULT_DEPTH):
+    total = sum(record[3] for record in records if record[1] == 0)
+    listed = [record for record in records if record[1] <= depth]
+
+    lines = [f"{len(records)} modules imported in {total / 1000:.1f} ms",
+             f"{'cumulative ms':>14} {'self ms':>8}  module"]
+    for name, level, self_time, cumulative in sorted(listed, key=lambda record: record[3], reverse=True)[:top]:
+        lines.append(f"{cumulative / 1000:>14.1f} {self_time / 1000:>8.1f}  {'  ' * level}{name}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time profile of the test entry points")
+    parser.add_argument("targets", nargs="+", help="modules to import, or test files with --collect")
+    parser.add_argument("--collect", action="store_true", help="profile `pytest --collect-only` of the test files")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="number of imports to list")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH, help="nesting depth of the listed imports")
+    options = parser.parse_args()
+
+    if options.collect:
+        # without -s pytest captures stderr during collection, hiding the import times of the test modules
+        arguments = ["-m", "pytest", "--collect-only", "-q", "-s"] + options.targets
+    else:
+        arguments = ["-c", "; ".join(f"import {target}" for target in options.targets)]
+
+    print(report(profile(arguments), options.top, options.depth))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import importlib
+
+
+class LazyModule(object):
+    """
+    Stands in for a module until one of its public attributes is used, the actual import happens at that point.
+    Lookups of private and dunder names (as done by pytest when it inspects the names of a test module during
+    collection) fail with AttributeError instead of importing the module.
+    """
+
+    def __init__(self, name):
+        self.__name = name
+        self.__module = None
+
+    @property
+    def is_loaded(self):
+        return self.__module is not None
+
+    def __getattr__(self, attribute):
+        if attribute.startswith("_"):
+            raise AttributeError(attribute)
+
+        if self.__module is None:
+            self.__module = importlib.import_module(self.__name)
+        return getattr(self.__module, attribute)
+
+    def __repr__(self):
+        return f"<lazy module '{self.__name}'{'' if self.is_loaded else ' (not loaded)'}>"
+
+
+def lazy_import(name):
+    return LazyModule(name)
@@ -1,23 +1,28 @@
 from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.common.by import By
 
+import DemoApp.Audit as Audit
 import DemoApp.PageItems as PageItems
+import DemoApp.Screenshots as Screenshots
 
 EMPTY_ALERT_ID = "alertEmpty"
+BUTTONS_SECTION_CLASS = "buttons-w"
+LOGO_CLASS = "logo-w"
 STYLE_HIDDEN = "z-index: -1"
 
 # LogIn Page
 ALERT_LOCATOR = (By.CLASS_NAME, "alert")
-BUTTONS_SECTION_LOCATOR = (By.CLASS_NAME, "buttons-w")
+BUTTONS_SECTION_LOCATOR = (By.CLASS_NAME, BUTTONS_SECTION_CLASS)
 FORM_GROUP_LOCATOR = (By.CLASS_NAME, "form-group")
 HEADER_TEXT_LOCATOR = (By.CSS_SELECTOR, "h4")
 IMAGE_LOCATOR = (By.CSS_SELECTOR, "img")
 LOGIN_FORM_LOCATOR = (By.CSS_SELECTOR, "form")
-LOGO_LOCATOR = (By.CLASS_NAME, "logo-w")
+LOGO_LOCATOR = (By.CLASS_NAME, LOGO_CLASS)
 
 # Dashboard Page
 AMOUNTS_HEADER_LOCATOR = (By.ID, "amount")
 BALANCE_LOCATOR = (By.CSS_SELECTOR, ".element-balances > .balance")
+BALANCES_SECTION_LOCATOR = (By.CLASS_NAME, "element-balances")
 COMPARE_EXPENSES_LOCATOR = (By.ID, "showExpensesChart")
 TABLE_ROW_LOCATOR = (By.CSS_SELECTOR, "tbody > tr")
 TRANSACTIONS_LOCATOR = (By.ID, "transactionsTable")
@@ -49,6 +54,9 @@ class PageWithHeader(object):
     def header_text(self):
         return self._header_element().text
 
+    def audit(self):
+        return Audit.PageAudit(self._driver)
+
 
 class Login(PageWithHeader):
 
@@ -130,6 +138,9 @@ class CustomerDashboard(object):
     def _canvas_element(self):
         return self._driver.find_element(*CANVAS_LOCATOR)
 
+    def _balances_section_element(self):
+        return self._driver.find_element(*BALANCES_SECTION_LOCATOR)
+
     def _balance_elements(self):
         return self._driver.find_elements(*BALANCE_LOCATOR)
 
@@ -161,6 +172,15 @@ class CustomerDashboard(object):
     def download_canvas(self):
         return self._driver.execute_script("return arguments[0].toDataURL('image/png')", self._canvas_element())
 
+    def canvas_region(self, scroll_into_view=False):
+        return Screenshots.element_region(self._driver, self._canvas_element(), scroll_into_view)
+
+    def balances_region(self, scroll_into_view=False):
+        return Screenshots.element_region(self._driver, self._balances_section_element(), scroll_into_view)
+
+    def transactions_region(self, scroll_into_view=False):
+        return Screenshots.element_region(self._driver, self._transactions_table(), scroll_into_view)
+
     def is_loaded(self):
         try:
             # NOTE: amounts column header is clearly not optimal candidate for checking if page has been loaded fully
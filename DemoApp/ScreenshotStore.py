@@ -0,0 +1,280 @@
+import hashlib
+import json
+import os
+import zlib
+
+import DemoApp.Imports as Imports
+import DemoApp.Screenshots as Screenshots
+
+Image = Imports.lazy_import("PIL.Image")
+
+BLOCK_SIZE = 64
+HASH_SIZE = 8
+DEFAULT_MAX_DISTANCE = 10
+
+BLOCKS_DIRECTORY = "blocks"
+IMAGES_DIRECTORY = "images"
+INDEX_FILE = "index.jsonl"
+
+
+class PerceptualHash(object):
+    """
+    Difference hash computed band by band, so the image never has to be in memory as a whole. Every band of rows is
+    shrunk to HASH_SIZE + 1 grey columns, the bands are then merged into HASH_SIZE rows weighted by their overlap.
+    Each bit of the hash tells whether the brightness grows from left to right in the resulting grid. Near-identical
+    screenshots (e.g. differing only in an alert text) end up with hashes only a few bits apart.
+    """
+
+    def __init__(self, height):
+        self.__height = height
+        self.__top = 0
+        self.__grid = [[0.0] * (HASH_SIZE + 1) for _ in range(HASH_SIZE)]
+
+    def add_band(self, width, band_height, data):
+        band = Image.frombytes("RGB", (width, band_height), data).convert("L")
+        columns = list(band.resize((HASH_SIZE + 1, 1), Image.BOX).getdata())
+
+        bottom = self.__top + band_height
+        for index, row in enumerate(self.__grid):
+            row_top = index * self.__height / HASH_SIZE
+            row_bottom = (index + 1) * self.__height / HASH_SIZE
+            overlap = min(bottom, row_bottom) - max(self.__top, row_top)
+            if overlap > 0:
+                for column, brightness in enumerate(columns):
+                    row[column] += brightness * overlap
+        self.__top = bottom
+
+    @property
+    def value(self):
+        """
+        :return: 64 bit hash as an int
+        """
+        value = 0
+        for row in self.__grid:
+            for left, right in zip(row, row[1:]):
+                value = (value << 1) | (left < right)
+        return value
+
+
+def _bands(rows):
+    """
+    Groups the rows into bands of BLOCK_SIZE rows.
+    :return: generator of (number of rows, band data) tuples
+    """
+    band = bytearray()
+    band_rows = 0
+    for row in rows:
+        band += row
+        band_rows += 1
+        if band_rows == BLOCK_SIZE:
+            yield band_rows, band
+            band = bytearray()
+            band_rows = 0
+    if band_rows:
+        yield band_rows, band
+
+
+def perceptual_hash(width, height, rows):
+    phash = PerceptualHash(height)
+    for band_rows, band in _bands(rows):
+        phash.add_band(width, band_rows, band)
+    return phash.value
+
+
+def hamming_distance(first, second):
+    return bin(first ^ second).count("1")
+
+
+class HashIndex(object):
+    """
+    BK-tree over perceptual hashes. Searching for the nearest hash only visits the subtrees whose distance range can
+    still contain a closer match, so lookups stay fast with long checkpoint histories.
+    """
+
+    def __init__(self):
+        self.__root = None
+
+    def add(self, phash, item):
+        if self.__root is None:
+            self.__root = (phash, [item], {})
+            return
+
+        node = self.__root
+        while True:
+            distance = hamming_distance(phash, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            if distance not in node[2]:
+                node[2][distance] = (phash, [item], {})
+                return
+            node = node[2][distance]
+
+    def nearest(self, phash, max_distance, accept=lambda item: True):
+        """
+        :return: (item, distance) of the closest accepted item within max_distance or None
+        """
+        best = None
+        candidates = [self.__root] if self.__root else []
+
+        while candidates:
+            node = candidates.pop()
+            distance = hamming_distance(phash, node[0])
+            limit = best[1] if best else max_distance
+
+            if distance <= limit:
+                accepted = [item for item in node[1] if accept(item)]
+                if accepted and (best is None or distance < best[1]):
+                    best = (accepted[-1], distance)
+                    limit = distance
+
+            candidates.extend(child for child_distance, child in node[2].items()
+                              if distance - limit <= child_distance <= distance + limit)
+
+        return best
+
+
+class ScreenshotStore(object):
+    """
+    Content addressed store of visual checkpoints. Every screenshot is cut into BLOCK_SIZE x BLOCK_SIZE pixel blocks,
+    each distinct block is kept once (zlib compressed, named by its SHA-1) and images are rebuilt on demand from their
+    block list. A perceptual hash of every image is indexed to find the nearest earlier capture.
+    Files are written atomically (temporary file and rename) and the index is append-only, so an interrupted run never
+    leaves a corrupt block behind and adding an image costs the same however long the history is.
+    """
+
+    def __init__(self, directory):
+        self.__directory = directory
+        self.__index = HashIndex()
+        self.__images = {}
+
+        os.makedirs(os.path.join(directory, BLOCKS_DIRECTORY), exist_ok=True)
+        os.makedirs(os.path.join(directory, IMAGES_DIRECTORY), exist_ok=True)
+
+        self.__index_path = os.path.join(directory, INDEX_FILE)
+        if os.path.exists(self.__index_path):
+            with open(self.__index_path) as index_file:
+                for line in index_file:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # last line of an interrupted run, its manifest may be incomplete as well
+                        continue
+                    self.__register(record)
+
+    def __register(self, record):
+        self.__images[record["id"]] = record
+        self.__index.add(int(record["phash"], 16), record["id"])
+
+    def _block_path(self, digest):
+        return os.path.join(self.__directory, BLOCKS_DIRECTORY, digest[:2], digest)
+
+    def _manifest_path(self, image_id):
+        return os.path.join(self.__directory, IMAGES_DIRECTORY, f"{image_id}.json")
+
+    @staticmethod
+    def _write_atomically(path, data):
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as output_file:
+            output_file.write(data)
+        os.replace(temporary_path, path)
+
+    def _store_block(self, data):
+        digest = hashlib.sha1(data).hexdigest()
+        path = self._block_path(digest)
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._write_atomically(path, zlib.compress(data))
+            return digest, True
+        return digest, False
+
+    def _load_block(self, digest):
+        with open(self._block_path(digest), "rb") as block_file:
+            return zlib.decompress(block_file.read())
+
+    def add(self, name, png):
+        """
+        :param name: name of the checkpoint, e.g. the tag of the visual check
+        :param png: screenshot as PNG bytes
+        :return: record of the stored image, with the number of blocks that were new to the store
+        """
+        screenshot = Screenshots.DecodedScreenshot(png)
+        return self.add_rows(name, screenshot.width, screenshot.height, screenshot.rows(0, screenshot.height))
+
+    def add_rows(self, name, width, height, rows):
+        """
+        Stores an image given row by row (e.g. FullPageCapture.rows() or DecodedScreenshot.crop()), only one band of
+        BLOCK_SIZE rows is held in memory.
+        :return: record of the stored image, with the number of blocks that were new to the store
+        """
+        phash = PerceptualHash(height)
+        row_size = width * Screenshots.BYTES_PER_PIXEL
+        blocks = []
+        new_blocks = 0
+        rows_stored = 0
+
+        for band_rows, band in _bands(rows):
+            phash.add_band(width, band_rows, band)
+            view = memoryview(band)
+            for left in range(0, width, BLOCK_SIZE):
+                start = left * Screenshots.BYTES_PER_PIXEL
+                end = min(left + BLOCK_SIZE, width) * Screenshots.BYTES_PER_PIXEL
+                digest, is_new = self._store_block(b"".join(view[y * row_size + start:y * row_size + end]
+                                                            for y in range(band_rows)))
+                blocks.append(digest)
+                new_blocks += is_new
+            rows_stored += band_rows
+
+        if rows_stored != height:
+            raise ValueError(f"Image has {rows_stored} rows, {height} expected")
+
+        image_id = f"{len(self.__images):06d}-{phash.value:016x}"
+        manifest = {"id": image_id, "name": name, "phash": f"{phash.value:016x}",
+                    "width": width, "height": height, "blocks": blocks}
+        self._write_atomically(self._manifest_path(image_id), json.dumps(manifest).encode("utf-8"))
+
+        record = {"id": image_id, "name": name, "phash": manifest["phash"], "width": width, "height": height}
+        with open(self.__index_path, "a") as index_file:
+            index_file.write(json.dumps(record) + "\n")
+        self.__register(record)
+
+        return dict(record, new_blocks=new_blocks, total_blocks=len(blocks))
+
+    @property
+    def images(self):
+        return list(self.__images.values())
+
+    def nearest(self, png, max_distance=DEFAULT_MAX_DISTANCE, name=None):
+        """
+        Finds the most similar earlier capture, optionally only among the captures of the same checkpoint.
+        :return: (record, hamming distance of the perceptual hashes) or None if nothing is within max_distance
+        """
+        screenshot = Screenshots.DecodedScreenshot(png)
+        phash = perceptual_hash(screenshot.width, screenshot.height, screenshot.rows(0, screenshot.height))
+        match = self.__index.nearest(phash, max_distance,
+                                     lambda image_id: name is None or self.__images[image_id]["name"] == name)
+        return (self.__images[match[0]], match[1]) if match else None
+
+    def save_image(self, image_id, fp):
+        """
+        Rebuilds the image from its blocks and streams it into a PNG file. Only one row of blocks is held in memory.
+        """
+        with open(self._manifest_path(image_id)) as manifest_file:
+            manifest = json.load(manifest_file)
+
+        width, height = manifest["width"], manifest["height"]
+        blocks_per_row = -(-width // BLOCK_SIZE)
+        writer = Screenshots.PngStreamWriter(fp, width, height)
+
+        for band, top in enumerate(range(0, height, BLOCK_SIZE)):
+            digests = manifest["blocks"][band * blocks_per_row:(band + 1) * blocks_per_row]
+            blocks = [memoryview(self._load_block(digest)) for digest in digests]
+            widths = [min(BLOCK_SIZE, width - left) * Screenshots.BYTES_PER_PIXEL
+                      for left in range(0, width, BLOCK_SIZE)]
+
+            for y in range(min(BLOCK_SIZE, height - top)):
+                writer.write_row(b"".join(block[y * size:(y + 1) * size] for block, size in zip(blocks, widths)))
+
+        writer.close()
+        return width, height
@@ -0,0 +1,256 @@
+import collections
+import io
+import struct
+import zlib
+
+import DemoApp.Imports as Imports
+
+Image = Imports.lazy_import("PIL.Image")
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_BIT_DEPTH = 8
+PNG_COLOR_TYPE_RGB = 2
+PNG_FILTER_NONE = b"\x00"
+IDAT_CHUNK_SIZE = 64 * 1024
+BYTES_PER_PIXEL = 3
+
+PAGE_METRICS_SCRIPT = """
+var root = document.documentElement;
+return [Math.max(root.scrollHeight, document.body.scrollHeight),
+        window.innerHeight,
+        window.devicePixelRatio,
+        window.pageYOffset];
+"""
+SCROLL_TO_SCRIPT = "window.scrollTo(0, arguments[0]); return window.pageYOffset;"
+ELEMENT_REGION_SCRIPT = """
+if (arguments[1]) {
+    arguments[0].scrollIntoView({block: 'nearest', inline: 'nearest'});
+}
+var rect = arguments[0].getBoundingClientRect();
+return [rect.left, rect.top, rect.width, rect.height, window.devicePixelRatio];
+"""
+
+# position and size in device pixels, relative to the viewport
+Region = collections.namedtuple("Region", ["left", "top", "width", "height"])
+
+
+class PngStreamWriter(object):
+    """
+    Minimal PNG encoder which accepts the image one row at a time, so the whole picture never has to be held in
+    memory. Rows are written unfiltered, compressed data is flushed to the file in IDAT chunks of bounded size.
+    """
+
+    def __init__(self, fp, width, height, compression_level=6):
+        self.__fp = fp
+        self.__width = width
+        self.__height = height
+        self.__rows_written = 0
+        self.__pending = bytearray()
+        self.__compressor = zlib.compressobj(compression_level)
+
+        self.__fp.write(PNG_SIGNATURE)
+        self.__write_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, PNG_BIT_DEPTH, PNG_COLOR_TYPE_RGB, 0, 0, 0))
+
+    @property
+    def row_size(self):
+        return self.__width * BYTES_PER_PIXEL
+
+    def write_row(self, row):
+        if len(row) != self.row_size:
+            raise ValueError(f"Row has {len(row)} bytes, {self.row_size} expected")
+        if self.__rows_written == self.__height:
+            raise ValueError("All rows of the image have already been written")
+
+        self.__pending += self.__compressor.compress(PNG_FILTER_NONE)
+        self.__pending += self.__compressor.compress(row)
+        self.__rows_written += 1
+
+        if len(self.__pending) >= IDAT_CHUNK_SIZE:
+            self.__flush_pending()
+
+    def close(self):
+        if self.__rows_written != self.__height:
+            raise ValueError(f"Only {self.__rows_written} of {self.__height} rows have been written")
+
+        self.__pending += self.__compressor.flush()
+        self.__flush_pending()
+        self.__write_chunk(b"IEND", b"")
+
+    def __flush_pending(self):
+        if self.__pending:
+            self.__write_chunk(b"IDAT", bytes(self.__pending))
+            self.__pending = bytearray()
+
+    def __write_chunk(self, chunk_type, data):
+        self.__fp.write(struct.pack(">I", len(data)))
+        self.__fp.write(chunk_type)
+        self.__fp.write(data)
+        self.__fp.write(struct.pack(">I", zlib.crc32(chunk_type + data) & 0xffffffff))
+
+
+class DecodedScreenshot(object):
+    """
+    A single viewport screenshot decoded into a raw RGB buffer. Rows are handed out as memoryview slices of that
+    buffer, therefore reading them does not copy pixel data.
+    """
+
+    def __init__(self, png):
+        image = Image.open(io.BytesIO(png)).convert("RGB")
+        self.width, self.height = image.size
+        self.__buffer = memoryview(image.tobytes())
+
+    @property
+    def row_size(self):
+        return self.width * BYTES_PER_PIXEL
+
+    def row(self, y):
+        start = y * self.row_size
+        return self.__buffer[start:start + self.row_size]
+
+    def rows(self, first, last):
+        for y in range(first, last):
+            yield self.row(y)
+
+    def clip(self, region):
+        left = min(max(region.left, 0), self.width)
+        top = min(max(region.top, 0), self.height)
+        right = min(max(region.left + region.width, left), self.width)
+        bottom = min(max(region.top + region.height, top), self.height)
+        return Region(left, top, right - left, bottom - top)
+
+    def crop(self, region):
+        """
+        Yields the rows of the region (clipped to the screenshot) as memoryview slices of the decoded buffer.
+        """
+        region = self.clip(region)
+        start = region.left * BYTES_PER_PIXEL
+        end = start + region.width * BYTES_PER_PIXEL
+        for row in self.rows(region.top, region.top + region.height):
+            yield row[start:end]
+
+
+class FullPageCapture(object):
+    """
+    Captures the whole page by scrolling it one viewport at a time. The rows of the page are produced by the rows()
+    generator tile by tile, so peak memory is a single decoded viewport screenshot regardless of the length of the page.
+    When the browser cannot scroll any further (last tile), the rows overlapping with the previous tile are skipped,
+    therefore the rows are the same as the ones of all tiles stitched in memory.
+    The first tile is taken right away to know the width of the page in device pixels, the original scroll position
+    is restored once rows() has finished.
+    """
+
+    def __init__(self, driver):
+        self.__driver = driver
+        page_height, viewport_height, self.__pixel_ratio, self.__original_offset = \
+            driver.execute_script(PAGE_METRICS_SCRIPT)
+
+        self.height = round(page_height * self.__pixel_ratio)
+        self.__viewport_rows = round(viewport_height * self.__pixel_ratio)
+        if not self.height or not self.__viewport_rows:
+            raise ValueError("Page has no content to capture")
+
+        self.__first_tile = self.__capture(0)
+        self.width = self.__first_tile[0].width
+
+    def __capture(self, rows_done):
+        requested_offset = rows_done / self.__pixel_ratio
+        actual_offset = self.__driver.execute_script(SCROLL_TO_SCRIPT, requested_offset)
+        tile = DecodedScreenshot(self.__driver.get_screenshot_as_png())
+
+        # offsets are compared in device pixels, browsers report pageYOffset with less precision than it was requested.
+        # A tile the browser could not scroll any further ends at the bottom of the page, whatever the rounding of its
+        # fractional offset is
+        visible_rows = min(tile.height, self.__viewport_rows)
+        tile_top = round(actual_offset * self.__pixel_ratio)
+        if tile_top < rows_done:
+            tile_top = max(self.height - visible_rows, 0)
+
+        # rows of the tile already written from the previous one, when the browser could not scroll any further
+        first_row = rows_done - tile_top
+        if first_row < 0:
+            raise ValueError(f"Page scrolled past the requested offset: {actual_offset} instead of {requested_offset}")
+        last_row = min(visible_rows, first_row + self.height - rows_done)
+        return tile, first_row, last_row
+
+    def rows(self):
+        rows_done = 0
+        tile, first_row, last_row = self.__first_tile
+        self.__first_tile = None
+        try:
+            while True:
+                if tile.width != self.width:
+                    raise ValueError(f"Page width changed while capturing: {tile.width} instead of {self.width}")
+                if last_row <= first_row:
+                    break
+
+                yield from tile.rows(first_row, last_row)
+
+                rows_done += last_row - first_row
+                tile = None
+                if rows_done >= self.height:
+                    break
+                tile, first_row, last_row = self.__capture(rows_done)
+        finally:
+            self.__driver.execute_script(SCROLL_TO_SCRIPT, self.__original_offset)
+
+        if rows_done != self.height:
+            raise ValueError(f"Page changed while capturing: {rows_done} of {self.height} rows captured")
+
+
+def save_full_page_screenshot(driver, fp, compression_level=6):
+    """
+    Streams the rows of a FullPageCapture straight into a PNG file.
+    :param driver: WebDriver instance with the page already loaded
+    :param fp: file-like object opened for binary writing
+    :return: (width, height) of the written image in device pixels
+    """
+    capture = FullPageCapture(driver)
+    writer = PngStreamWriter(fp, capture.width, capture.height, compression_level)
+    for row in capture.rows():
+        writer.write_row(row)
+    writer.close()
+
+    return capture.width, capture.height
+
+
+def element_region(driver, element, scroll_into_view=False):
+    """
+    Resolves the bounding rectangle of the element together with the device pixel ratio in a single script call.
+    The page is left where it is unless scroll_into_view is set, an element outside of the viewport then has a Region
+    which is clipped away by region_rows.
+    :param scroll_into_view: scroll the element into the viewport first (changes the scroll position of the page)
+    :return: Region of the element in device pixels of the viewport screenshot
+    """
+    left, top, width, height, pixel_ratio = driver.execute_script(ELEMENT_REGION_SCRIPT, element, scroll_into_view)
+    return Region(round(left * pixel_ratio),
+                  round(top * pixel_ratio),
+                  round(width * pixel_ratio),
+                  round(height * pixel_ratio))
+
+
+def region_rows(driver, region):
+    """
+    Takes a viewport screenshot and crops the region out of it. Cropping slices the decoded buffer, pixel data outside
+    of the region is never copied.
+    :param region: Region in device pixels, e.g. the result of element_region
+    :return: (region clipped to the screenshot, generator of its rows)
+    """
+    screenshot = DecodedScreenshot(driver.get_screenshot_as_png())
+    region = screenshot.clip(region)
+    if not region.width or not region.height:
+        raise ValueError(f"Region {region} is outside of the viewport")
+    return region, screenshot.crop(region)
+
+
+def save_region_screenshot(driver, region, fp, compression_level=6):
+    """
+    Streams only the rows of the given region of a viewport screenshot into a PNG file.
+    :return: the region actually written, clipped to the screenshot
+    """
+    region, rows = region_rows(driver, region)
+    writer = PngStreamWriter(fp, region.width, region.height, compression_level)
+    for row in rows:
+        writer.write_row(row)
+    writer.close()
+
+    return region
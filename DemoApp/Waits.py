@@ -0,0 +1,196 @@
+import bisect
+import json
+import os
+import re
+import statistics
+import time
+import urllib.parse
+import warnings
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+STATS_DIRECTORY = ".wait_stats"
+
+# histogram buckets are spaced geometrically from 10 ms up to about a minute
+BUCKET_BASE_SEC = 0.01
+BUCKET_GROWTH = 1.25
+BUCKET_COUNT = 40
+BUCKET_BOUNDS = [BUCKET_BASE_SEC * BUCKET_GROWTH ** index for index in range(BUCKET_COUNT)]
+
+MIN_SAMPLES = 20
+TIMEOUT_PERCENTILE = 99
+TIMEOUT_MARGIN = 3
+# the adaptive timeout never goes below the larger of the two
+MIN_TIMEOUT_SEC = 2
+MIN_TIMEOUT_RATIO = 0.5
+
+FAST_POLL_PERCENTILE = 90
+MIN_POLL_SEC = 0.05
+MAX_POLL_SEC = 1
+POLL_BACKOFF = 2
+
+DRIFT_WINDOW = 10
+DRIFT_RATIO = 1.5
+
+
+class LatencyDriftWarning(UserWarning):
+    pass
+
+
+class WaitStats(object):
+    """
+    Persistent histogram of how long each named wait condition took in a given environment (System Under Test).
+    Besides the bucket counts the most recent durations are kept to detect drifting latency. A wait which timed out is
+    recorded as a sample of its timeout (the actual duration is known to be at least that long), so timeouts push the
+    percentiles up instead of being ignored.
+    """
+
+    __instances = {}
+
+    def __init__(self, path):
+        self.__path = path
+        self.__conditions = {}
+
+        if os.path.exists(path):
+            with open(path) as stats_file:
+                self.__conditions = json.load(stats_file)
+
+    @classmethod
+    def for_environment(cls, base_url, directory=STATS_DIRECTORY):
+        parsed = urllib.parse.urlsplit(base_url)
+        name = re.sub(r"[^\w.-]+", "_", parsed.netloc + parsed.path).strip("_")
+        path = os.path.join(directory, f"{name}.json")
+
+        if path not in cls.__instances:
+            cls.__instances[path] = cls(path)
+        return cls.__instances[path]
+
+    def _condition(self, name):
+        condition = self.__conditions.setdefault(name, {"buckets": [0] * (BUCKET_COUNT + 1), "recent": [],
+                                                        "timeouts": 0})
+        condition.setdefault("consecutive_timeouts", 0)
+        return condition
+
+    def _add_sample(self, name, duration):
+        condition = self._condition(name)
+        condition["buckets"][bisect.bisect_left(BUCKET_BOUNDS, duration)] += 1
+        condition["recent"] = (condition["recent"] + [duration])[-DRIFT_WINDOW:]
+
+        if self.is_drifting(name):
+            warnings.warn(f"Wait for '{name}' is drifting: recent median {self.recent_median(name):.3f}s, "
+                          f"historical median {self.percentile(name, 50):.3f}s", LatencyDriftWarning)
+
+    def record(self, name, duration):
+        self._condition(name)["consecutive_timeouts"] = 0
+        self._add_sample(name, duration)
+
+    def record_timeout(self, name, timeout):
+        condition = self._condition(name)
+        condition["timeouts"] += 1
+        condition["consecutive_timeouts"] += 1
+        self._add_sample(name, timeout)
+
+    def consecutive_timeouts(self, name):
+        """
+        :return: number of waits which timed out since the last one that succeeded
+        """
+        return self.__conditions[name].get("consecutive_timeouts", 0) if name in self.__conditions else 0
+
+    def samples(self, name):
+        return sum(self.__conditions[name]["buckets"]) if name in self.__conditions else 0
+
+    def percentile(self, name, percent):
+        """
+        :return: upper bound of the histogram bucket containing the given percentile, None without samples
+        """
+        total = self.samples(name)
+        if not total:
+            return None
+
+        rank = total * percent / 100
+        seen = 0
+        for index, count in enumerate(self.__conditions[name]["buckets"]):
+            seen += count
+            if count and seen >= rank:
+                return BUCKET_BOUNDS[min(index, BUCKET_COUNT - 1)]
+
+    def recent_median(self, name):
+        recent = self.__conditions[name]["recent"] if name in self.__conditions else []
+        return statistics.median(recent) if recent else None
+
+    def is_drifting(self, name):
+        if self.samples(name) < DRIFT_WINDOW * 2 or len(self.__conditions[name]["recent"]) < DRIFT_WINDOW:
+            return False
+        return self.recent_median(name) > self.percentile(name, 50) * DRIFT_RATIO
+
+    def drifting(self):
+        return [name for name in self.__conditions if self.is_drifting(name)]
+
+    def save(self):
+        directory = os.path.dirname(self.__path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temporary_path = self.__path + ".tmp"
+        with open(temporary_path, "w") as stats_file:
+            json.dump(self.__conditions, stats_file, indent=2, sort_keys=True)
+        os.replace(temporary_path, self.__path)
+
+
+class AdaptiveWait(object):
+    """
+    Drop-in replacement of WebDriverWait for named conditions. The timeout and the poll intervals of each condition
+    are derived from its recorded durations: polling is fast until most of the earlier waits would have finished and
+    backs off afterwards, the timeout is a margin over the slowest percentile but never longer than max_timeout.
+    Without enough history, and after a wait timed out until one succeeds again, max_timeout is used just like with a
+    plain WebDriverWait.
+    """
+
+    def __init__(self, driver, stats, max_timeout):
+        self.__driver = driver
+        self.__stats = stats
+        self.__max_timeout = max_timeout
+
+    def timeout(self, name):
+        if self.__stats.samples(name) < MIN_SAMPLES or self.__stats.consecutive_timeouts(name):
+            return self.__max_timeout
+
+        adaptive_timeout = self.__stats.percentile(name, TIMEOUT_PERCENTILE) * TIMEOUT_MARGIN
+        min_timeout = max(MIN_TIMEOUT_SEC, self.__max_timeout * MIN_TIMEOUT_RATIO)
+        return min(max(adaptive_timeout, min_timeout), self.__max_timeout)
+
+    def poll_intervals(self, name):
+        fast_until = self.__stats.percentile(name, FAST_POLL_PERCENTILE) or 0
+        interval = MIN_POLL_SEC
+        elapsed = 0
+
+        while True:
+            yield interval
+            elapsed += interval
+            if elapsed >= fast_until:
+                interval = min(interval * POLL_BACKOFF, MAX_POLL_SEC)
+
+    def until(self, name, condition, message=""):
+        timeout = self.timeout(name)
+        start_time = time.monotonic()
+        end_time = start_time + timeout
+
+        for interval in self.poll_intervals(name):
+            try:
+                value = condition(self.__driver)
+                if value:
+                    self.__stats.record(name, time.monotonic() - start_time)
+                    return value
+            except NoSuchElementException:
+                pass
+
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(interval, remaining))
+
+        self.__stats.record_timeout(name, timeout)
+        raise TimeoutException(message or f"'{name}' not met within {timeout:.1f} seconds")
+
+    def save(self):
+        self.__stats.save()
@@ -0,0 +1,242 @@
+import io
+import random
+import struct
+
+import pytest
+from PIL import Image
+
+import DemoApp.ScreenshotStore as ScreenshotStore
+import DemoApp.Screenshots as Screenshots
+
+VIEWPORT_CSS = (120, 50)
+
+
+def random_image(width, height, seed=0):
+    generator = random.Random(seed)
+    return Image.frombytes("RGB", (width, height), bytes(generator.randrange(256) for _ in range(width * height * 3)))
+
+
+def png_bytes(image):
+    output = io.BytesIO()
+    image.save(output, "PNG")
+    return output.getvalue()
+
+
+class FakeDriver(object):
+    """
+    Serves viewport screenshots cut out of a reference page image. Like in a real browser, scrolling is clamped at the
+    bottom of the page and the viewport scrolled to the end shows the last rows of the page. With float32_offsets the
+    scroll position is reported with single precision only, as some browsers do.
+    """
+
+    def __init__(self, page_height_css, pixel_ratio, float32_offsets=False):
+        self.pixel_ratio = pixel_ratio
+        self.float32_offsets = float32_offsets
+        self.page_height_css = page_height_css
+        self.page = random_image(round(VIEWPORT_CSS[0] * pixel_ratio), round(page_height_css * pixel_ratio))
+        self.offset = 0
+
+    def execute_script(self, script, *args):
+        if script == Screenshots.PAGE_METRICS_SCRIPT:
+            return [self.page_height_css, VIEWPORT_CSS[1], self.pixel_ratio, self.offset]
+        if script == Screenshots.SCROLL_TO_SCRIPT:
+            self.offset = max(0, min(args[0], self.page_height_css - VIEWPORT_CSS[1]))
+            if self.float32_offsets:
+                self.offset = struct.unpack("f", struct.pack("f", self.offset))[0]
+            return self.offset
+        if script == Screenshots.ELEMENT_REGION_SCRIPT:
+            # elements are (left, top, width, height) rectangles in CSS pixels of the page
+            element, scroll_into_view = args
+            left, top, width, height = element
+            if scroll_into_view and not self.offset <= top <= top + height <= self.offset + VIEWPORT_CSS[1]:
+                self.execute_script(Screenshots.SCROLL_TO_SCRIPT, top)
+            return [left, top - self.offset, width, height, self.pixel_ratio]
+        raise AssertionError(f"Unexpected script: {script}")
+
+    def get_screenshot_as_png(self):
+        viewport_rows = round(VIEWPORT_CSS[1] * self.pixel_ratio)
+        if self.offset >= self.page_height_css - VIEWPORT_CSS[1]:
+            top = self.page.height - viewport_rows
+        else:
+            top = round(self.offset * self.pixel_ratio)
+        bottom = top + viewport_rows
+        return png_bytes(self.page.crop((0, top, self.page.width, bottom)))
+
+
+class TestPngStreamWriter(object):
+
+    def test_round_trip(self):
+        image = random_image(37, 29)
+        output = io.BytesIO()
+
+        writer = Screenshots.PngStreamWriter(output, image.width, image.height)
+        raw = image.tobytes()
+        for y in range(image.height):
+            writer.write_row(raw[y * writer.row_size:(y + 1) * writer.row_size])
+        writer.close()
+
+        assert Image.open(io.BytesIO(output.getvalue())).tobytes() == raw
+
+    def test_wrong_row_size(self):
+        writer = Screenshots.PngStreamWriter(io.BytesIO(), 10, 2)
+        with pytest.raises(ValueError):
+            writer.write_row(b"\x00" * 29)
+
+    def test_missing_rows(self):
+        writer = Screenshots.PngStreamWriter(io.BytesIO(), 10, 2)
+        writer.write_row(b"\x00" * 30)
+        with pytest.raises(ValueError):
+            writer.close()
+
+
+class TestFullPageScreenshot(object):
+
+    @pytest.mark.parametrize("page_height_css, pixel_ratio",
+                             [(50, 1), (173, 1), (173, 2), (173, 1.5), (201, 1.5)])
+    def test_same_as_reference_stitch(self, page_height_css, pixel_ratio):
+        driver = FakeDriver(page_height_css, pixel_ratio)
+        output = io.BytesIO()
+
+        size = Screenshots.save_full_page_screenshot(driver, output)
+
+        assert size == driver.page.size
+        assert Image.open(io.BytesIO(output.getvalue())).tobytes() == driver.page.tobytes()
+
+    @pytest.mark.parametrize("page_height_css, pixel_ratio",
+                             [(301, 1.25), (301, 1.5), (301, 1.75), (173, 2.625), (1000, 1.1)])
+    def test_fractional_offsets(self, page_height_css, pixel_ratio):
+        driver = FakeDriver(page_height_css, pixel_ratio, float32_offsets=True)
+        output = io.BytesIO()
+
+        Screenshots.save_full_page_screenshot(driver, output)
+
+        assert Image.open(io.BytesIO(output.getvalue())).tobytes() == driver.page.tobytes()
+
+    def test_scroll_position_restored(self):
+        driver = FakeDriver(173, 2)
+        driver.offset = 30
+
+        Screenshots.save_full_page_screenshot(driver, io.BytesIO())
+
+        assert driver.offset == 30
+
+    def test_empty_page(self):
+        with pytest.raises(ValueError):
+            Screenshots.save_full_page_screenshot(FakeDriver(0, 1), io.BytesIO())
+
+
+class TestRegionScreenshot(object):
+
+    @pytest.mark.parametrize("pixel_ratio", [1, 1.5, 2])
+    def test_same_as_crop(self, pixel_ratio):
+        driver = FakeDriver(173, pixel_ratio)
+        region = Screenshots.element_region(driver, (10, 20, 50, 20))
+        output = io.BytesIO()
+
+        written = Screenshots.save_region_screenshot(driver, region, output)
+
+        expected = driver.page.crop((written.left, written.top,
+                                     written.left + written.width, written.top + written.height))
+        assert written == region
+        assert Image.open(io.BytesIO(output.getvalue())).tobytes() == expected.tobytes()
+
+    def test_clipped_to_viewport(self):
+        driver = FakeDriver(173, 2)
+        region = Screenshots.element_region(driver, (100, 40, 50, 20))
+
+        written, rows = Screenshots.region_rows(driver, region)
+
+        assert written == Screenshots.Region(200, 80, 40, 20)
+        assert len(list(rows)) == 20
+
+    def test_page_not_scrolled(self):
+        driver = FakeDriver(173, 1)
+        region = Screenshots.element_region(driver, (10, 120, 50, 20))
+
+        assert driver.offset == 0
+        with pytest.raises(ValueError):
+            Screenshots.region_rows(driver, region)
+
+    def test_scroll_into_view(self):
+        driver = FakeDriver(173, 1)
+        region = Screenshots.element_region(driver, (10, 120, 50, 20), scroll_into_view=True)
+
+        assert driver.offset == 120
+        assert region == Screenshots.Region(10, 0, 50, 20)
+
+
+class TestScreenshotStore(object):
+
+    def test_round_trip(self, tmp_path):
+        store = ScreenshotStore.ScreenshotStore(str(tmp_path))
+        image = random_image(150, 100)
+
+        record = store.add("checkpoint", png_bytes(image))
+        output = io.BytesIO()
+        store.save_image(record["id"], output)
+
+        assert record["total_blocks"] == 6
+        assert Image.open(io.BytesIO(output.getvalue())).tobytes() == image.tobytes()
+
+    def test_identical_blocks_stored_once(self, tmp_path):
+        store = ScreenshotStore.ScreenshotStore(str(tmp_path))
+        image = random_image(150, 100)
+        changed = image.copy()
+        changed.paste((0, 0, 0), (10, 10, 40, 20))
+
+        store.add("Login Page With Alert", png_bytes(image))
+        record = store.add("Login Page With Alert", png_bytes(changed))
+
+        assert record["new_blocks"] == 1
+        assert store.nearest(png_bytes(changed), max_distance=0)[0]["id"] == record["id"]
+
+    def test_full_page_rows(self, tmp_path):
+        store = ScreenshotStore.ScreenshotStore(str(tmp_path))
+        capture = Screenshots.FullPageCapture(FakeDriver(173, 1.5))
+
+        record = store.add_rows("full page", capture.width, capture.height, capture.rows())
+        output = io.BytesIO()
+        store.save_image(record["id"], output)
+
+        assert Image.open(io.BytesIO(output.getvalue())).size == (capture.width, capture.height)
+        assert record["phash"] == store.images[0]["phash"]
+
+    def test_index_reloaded(self, tmp_path):
+        store = ScreenshotStore.ScreenshotStore(str(tmp_path))
+        png = png_bytes(random_image(70, 70))
+        record = store.add("checkpoint", png)
+        with open(tmp_path / ScreenshotStore.INDEX_FILE, "a") as index_file:
+            index_file.write('{"id": "interrupt')
+
+        reloaded = ScreenshotStore.ScreenshotStore(str(tmp_path))
+
+        assert reloaded.images == [{key: record[key] for key in ("id", "name", "phash", "width", "height")}]
+        assert reloaded.nearest(png, name="checkpoint")[0]["id"] == record["id"]
+        assert reloaded.nearest(png, name="other checkpoint") is None
+
+
+class TestHashIndex(object):
+
+    @pytest.mark.parametrize("max_distance", [0, 3, 10, 64])
+    def test_nearest_same_as_brute_force(self, max_distance):
+        generator = random.Random(max_distance)
+        hashes = [generator.getrandbits(64) for _ in range(300)]
+        # near duplicates, like checkpoints differing only in a small detail
+        hashes += [phash ^ (1 << generator.randrange(64)) for phash in hashes[:100]]
+
+        index = ScreenshotStore.HashIndex()
+        for item, phash in enumerate(hashes):
+            index.add(phash, item)
+
+        for _ in range(50):
+            query = generator.choice(hashes) ^ generator.getrandbits(64) & generator.getrandbits(64) \
+                & generator.getrandbits(64)
+            distances = [ScreenshotStore.hamming_distance(query, phash) for phash in hashes]
+            closest = min(distances)
+
+            match = index.nearest(query, max_distance)
+            if closest > max_distance:
+                assert match is None
+            else:
+                assert match[1] == closest
+                assert distances[match[0]] == closest
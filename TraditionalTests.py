@@ -1,17 +1,21 @@
-import configparser
 import hashlib
 import time
 import urllib.request
 from decimal import Decimal
 
 import pytest
-from selenium import webdriver
 from selenium.common.exceptions import TimeoutException
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
 
-import DemoApp.Pages as Pages
+import DemoApp.Audit as Audit
+import DemoApp.Config as Config
+import DemoApp.Imports as Imports
+import DemoApp.Waits as Waits
 
+# the browser stack and the page objects built on it are loaded on first use, collecting the tests does not need them
+Pages = Imports.lazy_import("DemoApp.Pages")
+webdriver = Imports.lazy_import("selenium.webdriver")
+
+# upper limit of all waits, the actual timeouts are adapted to the recorded wait durations
 DEFAULT_TIMEOUT_SEC = 3
 
 CANVAS_ANIMATION_SEC = 1
@@ -22,6 +26,9 @@ REFERENCE_CANVAS_3YRS_MD5 = "062ed6be5f785811721544ef76e582bc"
 DEFAULT_CREDENTIALS = {"user": "user",
                        "password": "password"}
 
+ALERT_SHOWN = "alert shown"
+DASHBOARD_LOADED = "dashboard is_loaded"
+
 
 class TestLoginPageAppearance(object):
     """
@@ -33,13 +40,13 @@ class TestLoginPageAppearance(object):
     """
 
     def setup_class(self):
-        self.__config = configparser.ConfigParser()
-        self.__config.read("config.ini")
+        self.__config = Config.load()
         self.__driver = webdriver.Chrome()
         self.__page = Pages.Login(self.__driver, self.__config["environment"]["base_url"])
         
         self.__form_fields = self.__page.form_fields
         self.__social_icons = self.__page.buttons.social_icons
+        self.__audit = self.__page.audit()
 
     def teardown_class(self):
         self.__driver.quit()
@@ -96,12 +103,16 @@ class TestLoginPageAppearance(object):
 
     # known defect: non-complient with WCAG standards
     def test_logo_accessibility(self):
-        assert self.__page.logo_accessibility_text, "Product logo (containing an anchor) should have alternative text."
+        assert self.__audit.images(scope=Pages.LOGO_CLASS), "Product logo missing"
+        assert not self.__audit.findings(Audit.MISSING_ALT, scope=Pages.LOGO_CLASS), \
+            "Product logo (containing an anchor) should have alternative text."
 
     # known defect: non-complient with WCAG standards
     def test_social_icon_accessibility(self):
-        for icon in self.__page.buttons.social_icons:
-            assert icon.accessibility_text, "Functional elements without text should have alternative text."
+        assert self.__audit.images(scope=Pages.BUTTONS_SECTION_CLASS, in_link=True), "Social icons missing"
+        assert not self.__audit.findings(Audit.MISSING_ALT, scope=Pages.BUTTONS_SECTION_CLASS, in_link=True), \
+            "Functional elements without text should have alternative text:\n" \
+            + self.__audit.report(Audit.MISSING_ALT, scope=Pages.BUTTONS_SECTION_CLASS, in_link=True)
 
 
 class TestLoginFunctionality(object):
@@ -113,16 +124,20 @@ class TestLoginFunctionality(object):
     """
 
     def setup_class(self):
-        self.__config = configparser.ConfigParser()
-        self.__config.read("config.ini")
+        self.__config = Config.load()
         self.__driver = webdriver.Chrome()
-        self.__wait = WebDriverWait(self.__driver, DEFAULT_TIMEOUT_SEC)
+        self.__wait = Waits.AdaptiveWait(self.__driver,
+                                         Waits.WaitStats.for_environment(self.__config["environment"]["base_url"]),
+                                         DEFAULT_TIMEOUT_SEC)
 
     def setup_method(self):
         self.__page = Pages.Login(self.__driver, self.__config["environment"]["base_url"])
 
     def teardown_class(self):
-        self.__driver.quit()
+        try:
+            self.__driver.quit()
+        finally:
+            self.__wait.save()
 
     @pytest.mark.parametrize("user, password,expected",
                              [("", "", "Both Username and Password must be present"),
@@ -134,10 +149,11 @@ class TestLoginFunctionality(object):
         self.__page.submit()
 
         try:
-            self.__wait.until(lambda _: len(self.__page.alerts) == 1)
+            self.__wait.until(ALERT_SHOWN, lambda _: len(self.__page.alerts) == 1)
             assert self.__page.alerts[0] == expected
-        except TimeoutException:
-            assert False, f"No alert appeared within {DEFAULT_TIMEOUT_SEC} seconds"
+        except TimeoutException as error:
+            # the message of the wait has the timeout actually used, timeout() may differ after the wait timed out
+            assert False, f"No alert appeared: {error.msg}"
 
     @pytest.mark.parametrize("missing, expected",
                              [("user", "Username must be present"),
@@ -151,17 +167,18 @@ class TestLoginFunctionality(object):
         self.__page.submit()
 
         try:
-            self.__wait.until(lambda _: len(self.__page.alerts) == 1)
+            self.__wait.until(ALERT_SHOWN, lambda _: len(self.__page.alerts) == 1)
             assert self.__page.alerts[0] == expected
-        except TimeoutException:
-            assert False, f"No alert appeared within {DEFAULT_TIMEOUT_SEC} seconds"
+        except TimeoutException as error:
+            # the message of the wait has the timeout actually used, timeout() may differ after the wait timed out
+            assert False, f"No alert appeared: {error.msg}"
 
     def test_successful_login(self):
         self.__page.type_user_name(DEFAULT_CREDENTIALS["user"])
         self.__page.type_password(DEFAULT_CREDENTIALS["password"])
         self.__page.submit()
 
-        self.__wait.until(lambda _: Pages.CustomerDashboard(self.__driver).is_loaded())
+        self.__wait.until(DASHBOARD_LOADED, lambda _: Pages.CustomerDashboard(self.__driver).is_loaded())
         assert "hackathonApp" in self.__driver.current_url
 
     def __remove_credential(self, missing):
@@ -183,16 +200,20 @@ class TestTableSorting(object):
     """
 
     def setup_class(self):
-        self.__config = configparser.ConfigParser()
-        self.__config.read("config.ini")
+        self.__config = Config.load()
         self.__driver = webdriver.Chrome()
-        self.__wait = WebDriverWait(self.__driver, DEFAULT_TIMEOUT_SEC)
+        self.__wait = Waits.AdaptiveWait(self.__driver,
+                                         Waits.WaitStats.for_environment(self.__config["environment"]["base_url"]),
+                                         DEFAULT_TIMEOUT_SEC)
 
     def setup_method(self):
         self.__page = self.__open_customer_dashboard(DEFAULT_CREDENTIALS)
 
     def teardown_class(self):
-        self.__driver.quit()
+        try:
+            self.__driver.quit()
+        finally:
+            self.__wait.save()
 
     def test_ascending_by_amount(self):
         table_data_before = self.__amounts_to_decimal(self.__page.transactions())
@@ -210,7 +231,7 @@ class TestTableSorting(object):
         login_page.submit()
 
         dashboard_page = Pages.CustomerDashboard(self.__driver)
-        self.__wait.until(lambda _: dashboard_page.is_loaded())
+        self.__wait.until(DASHBOARD_LOADED, lambda _: dashboard_page.is_loaded())
 
         return dashboard_page
 
@@ -238,18 +259,22 @@ class TestCanvas(object):
     """
 
     def setup_class(self):
-        self.__config = configparser.ConfigParser()
-        self.__config.read("config.ini")
+        self.__config = Config.load()
 
-        chrome_options = Options()
+        chrome_options = webdriver.ChromeOptions()
         chrome_options.add_argument("--headless")
         chrome_options.add_argument("--window-size=1920,1080")
 
         self.__driver = webdriver.Chrome(options=chrome_options)
-        self.__wait = WebDriverWait(self.__driver, DEFAULT_TIMEOUT_SEC)
+        self.__wait = Waits.AdaptiveWait(self.__driver,
+                                         Waits.WaitStats.for_environment(self.__config["environment"]["base_url"]),
+                                         DEFAULT_TIMEOUT_SEC)
 
     def teardown_class(self):
-        self.__driver.quit()
+        try:
+            self.__driver.quit()
+        finally:
+            self.__wait.save()
 
     @pytest.mark.parametrize("number_of_years, expected_md5",
                              [(2, REFERENCE_CANVAS_2YRS_MD5),
@@ -273,7 +298,7 @@ class TestCanvas(object):
         login_page.submit()
 
         dashboard_page = Pages.CustomerDashboard(self.__driver)
-        self.__wait.until(lambda _: dashboard_page.is_loaded())
+        self.__wait.until(DASHBOARD_LOADED, lambda _: dashboard_page.is_loaded())
 
         dashboard_page.view_expense_chart()
 
@@ -297,13 +322,17 @@ class TestAdverts(object):
     """
 
     def setup_class(self):
-        self.__config = configparser.ConfigParser()
-        self.__config.read("config.ini")
+        self.__config = Config.load()
         self.__driver = webdriver.Chrome()
-        self.__wait = WebDriverWait(self.__driver, DEFAULT_TIMEOUT_SEC)
+        self.__wait = Waits.AdaptiveWait(self.__driver,
+                                         Waits.WaitStats.for_environment(self.__config["environment"]["base_url"]),
+                                         DEFAULT_TIMEOUT_SEC)
 
     def teardown_class(self):
-        self.__driver.quit()
+        try:
+            self.__driver.quit()
+        finally:
+            self.__wait.save()
 
     def test_two_adverts_on_dashboard(self):
         self.__go_to_dashboard()
@@ -325,7 +354,7 @@ class TestAdverts(object):
         self.__page.submit()
 
         self.__page = Pages.CustomerDashboard(self.__driver)
-        self.__wait.until(lambda _: self.__page.is_loaded())
+        self.__wait.until(DASHBOARD_LOADED, lambda _: self.__page.is_loaded())
 
     @staticmethod
     def __is_file_present(url):
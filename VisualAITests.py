@@ -1,19 +1,28 @@
-import configparser
 import time
 
 import pytest
-from applitools.selenium import Eyes
-from selenium import webdriver
-from selenium.webdriver.support.ui import WebDriverWait
 
-import DemoApp.Pages as Pages
+import DemoApp.Config as Config
+import DemoApp.Imports as Imports
+import DemoApp.ScreenshotStore as ScreenshotStore
+import DemoApp.Screenshots as Screenshots
+import DemoApp.Waits as Waits
+
+# the Eyes SDK (with Pillow), the browser stack and page objects are loaded on first use, not at collection
+eyes_selenium = Imports.lazy_import("applitools.selenium")
+Pages = Imports.lazy_import("DemoApp.Pages")
+webdriver = Imports.lazy_import("selenium.webdriver")
 
 CANVAS_ANIMATION_SEC = 1
+# upper limit of all waits, the actual timeouts are adapted to the recorded wait durations
 DEFAULT_TIMEOUT_SEC = 10
 DEFAULT_VIEWPORT = {'width': 1024, 'height': 768}
 DEFAULT_CREDENTIALS = {"user": "user",
                        "password": "password"}
 
+ALERT_SHOWN = "alert shown"
+DASHBOARD_LOADED = "dashboard is_loaded"
+
 
 class TestDemoApp(object):
     """
@@ -27,18 +36,25 @@ class TestDemoApp(object):
     """
 
     def setup_class(self):
-        self.__config = configparser.ConfigParser()
-        self.__config.read("config.ini")
+        self.__config = Config.load()
 
         self.__driver = webdriver.Chrome()
-        self.__wait = WebDriverWait(self.__driver, DEFAULT_TIMEOUT_SEC)
+        self.__wait = Waits.AdaptiveWait(self.__driver,
+                                         Waits.WaitStats.for_environment(self.__config["environment"]["base_url"]),
+                                         DEFAULT_TIMEOUT_SEC)
 
-        self.__eyes = Eyes()
+        self.__eyes = eyes_selenium.Eyes()
         self.__eyes.api_key = self.__config["applitools"]["api_key"]
 
+        store_directory = self.__config.get("screenshots", "store_directory", fallback="")
+        self.__store = ScreenshotStore.ScreenshotStore(store_directory) if store_directory else None
+
     def teardown_class(self):
-        self.__driver.quit()
-        self.__eyes.abort()
+        try:
+            self.__driver.quit()
+            self.__eyes.abort()
+        finally:
+            self.__wait.save()
 
     def teardown_method(self):
         self.__eyes.force_full_page_screenshot = False
@@ -46,7 +62,7 @@ class TestDemoApp(object):
     def test_login_page_appearance(self):
         self.__driver.get(self.__config["environment"]["base_url"])
         self.__eyes.open(self.__driver, "DemoApp", "Login Page Appearance", DEFAULT_VIEWPORT)
-        self.__eyes.check_window("Login Page Default")
+        self.__check_window("Login Page Default")
         self.__eyes.close()
 
     @pytest.mark.parametrize("user, password, test_name",
@@ -59,9 +75,9 @@ class TestDemoApp(object):
         page.type_password(password)
         page.submit()
 
-        self.__wait.until(lambda _: len(page.alerts) == 1)
+        self.__wait.until(ALERT_SHOWN, lambda _: len(page.alerts) == 1)
         self.__eyes.open(self.__driver, "DemoApp", f"Credentials Missing - {test_name}", DEFAULT_VIEWPORT)
-        self.__eyes.check_window("Login Page With Alert")
+        self.__check_window("Login Page With Alert")
         self.__eyes.close()
 
     @pytest.mark.parametrize("missing", ["User", "Password", "Both"])
@@ -73,10 +89,10 @@ class TestDemoApp(object):
         self.__remove_credential(page, missing)
         page.submit()
 
-        self.__wait.until(lambda _: len(page.alerts) == 1)
+        self.__wait.until(ALERT_SHOWN, lambda _: len(page.alerts) == 1)
 
         self.__eyes.open(self.__driver, "DemoApp", f"Credentials Removed - {missing} Empty", DEFAULT_VIEWPORT)
-        self.__eyes.check_window("Login Page With Alert")
+        self.__check_window("Login Page With Alert")
         self.__eyes.close()
 
     def test_successful_login(self):
@@ -85,10 +101,10 @@ class TestDemoApp(object):
         page.type_password(DEFAULT_CREDENTIALS["password"])
         page.submit()
 
-        self.__wait.until(lambda _: Pages.CustomerDashboard(self.__driver).is_loaded())
+        self.__wait.until(DASHBOARD_LOADED, lambda _: Pages.CustomerDashboard(self.__driver).is_loaded())
 
         self.__eyes.open(self.__driver, "DemoApp", "Successful Login", DEFAULT_VIEWPORT)
-        self.__eyes.check_window("Customer Dashboard")
+        self.__check_window("Customer Dashboard")
         self.__eyes.close()
 
     def test_table_sorting(self):
@@ -97,11 +113,11 @@ class TestDemoApp(object):
 
         self.__eyes.force_full_page_screenshot = True
         self.__eyes.open(self.__driver, "DemoApp", "Table Sorting", DEFAULT_VIEWPORT)
-        self.__eyes.check_window("Customer Dashboard - Default")
+        self.__check_window("Customer Dashboard - Default")
 
         page.order_by_amount()
 
-        self.__eyes.check_window("Customer Dashboard - Sorted by Amount")
+        self.__check_window("Customer Dashboard - Sorted by Amount")
         self.__eyes.close()
 
     @pytest.mark.parametrize("width, height",
@@ -120,28 +136,46 @@ class TestDemoApp(object):
                          f"Expenses Chart - {width}x{height}",
                          {'width': width, 'height': height})
 
-        self.__eyes.check_window("Chart Two Years")
+        self.__check_region("Chart Two Years", Pages.CANVAS_LOCATOR, page.canvas_region)
 
         page.include_another_year()
         self.__wait_for_canvas_animation()
 
-        self.__eyes.check_window("Chart Three Years")
+        self.__check_region("Chart Three Years", Pages.CANVAS_LOCATOR, page.canvas_region)
         self.__eyes.close()
 
     def test_two_adverts_on_dashboard(self):
         self.__do_login(query_string="?showAd=true")
+        page = Pages.CustomerDashboard(self.__driver)
 
         self.__eyes.open(self.__driver, "DemoApp", "Adverts On Dashboard", DEFAULT_VIEWPORT)
-        self.__eyes.check_window("Dashboard With Adverts")
+        self.__check_region("Dashboard With Adverts", Pages.BALANCES_SECTION_LOCATOR, page.balances_region)
         self.__eyes.close()
 
+    def __check_window(self, tag):
+        if self.__store is not None:
+            # the streaming capture only feeds the local store, Eyes takes its own (full page) screenshot below
+            if self.__eyes.force_full_page_screenshot:
+                capture = Screenshots.FullPageCapture(self.__driver)
+                self.__store.add_rows(tag, capture.width, capture.height, capture.rows())
+            else:
+                self.__store.add(tag, self.__driver.get_screenshot_as_png())
+        self.__eyes.check_window(tag)
+
+    def __check_region(self, tag, locator, page_region):
+        if self.__store is not None:
+            # Eyes scrolls to the region as well, scrolling first keeps both captures of the same viewport
+            region, rows = Screenshots.region_rows(self.__driver, page_region(scroll_into_view=True))
+            self.__store.add_rows(tag, region.width, region.height, rows)
+        self.__eyes.check_region(locator, tag)
+
     def __do_login(self, credentials=DEFAULT_CREDENTIALS, query_string=""):
         page = Pages.Login(self.__driver, self.__config["environment"]["base_url"], query_string)
         page.type_user_name(credentials["user"])
         page.type_password(credentials["password"])
         page.submit()
 
-        self.__wait.until(lambda _: Pages.CustomerDashboard(self.__driver).is_loaded())
+        self.__wait.until(DASHBOARD_LOADED, lambda _: Pages.CustomerDashboard(self.__driver).is_loaded())
 
     @staticmethod
     def __remove_credential(page, missing):
@@ -0,0 +1,162 @@
+import itertools
+import warnings
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+import DemoApp.Waits as Waits
+
+MAX_TIMEOUT_SEC = 10
+CONDITION = "DASHBOARD_LOADED"
+
+
+class FakeClock(object):
+    """
+    Replaces the time module of DemoApp.Waits, sleeping only advances the clock.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class StubDriver(object):
+    """
+    Condition target which becomes ready at a given time of the fake clock.
+    """
+
+    def __init__(self, clock, ready_at):
+        self.clock = clock
+        self.ready_at = ready_at
+
+    def is_ready(self):
+        if self.clock.now < self.ready_at:
+            raise NoSuchElementException("not yet")
+        return True
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(Waits, "time", fake_clock)
+    return fake_clock
+
+
+@pytest.fixture
+def stats(tmp_path):
+    return Waits.WaitStats(str(tmp_path / "stats.json"))
+
+
+def record_all(stats, durations, name=CONDITION):
+    for duration in durations:
+        stats.record(name, duration)
+
+
+class TestWaitStats(object):
+
+    def test_percentile(self, stats):
+        record_all(stats, ([0.1] * 9 + [2.0]) * 10)
+
+        assert 0.1 <= stats.percentile(CONDITION, 50) < 0.1 * Waits.BUCKET_GROWTH
+        assert 0.1 <= stats.percentile(CONDITION, 90) < 0.1 * Waits.BUCKET_GROWTH
+        assert 2.0 <= stats.percentile(CONDITION, 99) < 2.0 * Waits.BUCKET_GROWTH
+        assert stats.percentile("unknown", 50) is None
+
+    def test_saved_and_loaded(self, stats, tmp_path):
+        record_all(stats, [0.3] * 4)
+        stats.record_timeout(CONDITION, 5)
+        stats.save()
+
+        loaded = Waits.WaitStats(str(tmp_path / "stats.json"))
+
+        assert loaded.samples(CONDITION) == 5
+        assert loaded.consecutive_timeouts(CONDITION) == 1
+        assert loaded.percentile(CONDITION, 50) == stats.percentile(CONDITION, 50)
+
+    def test_drift_detected(self, stats):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            record_all(stats, [0.2] * Waits.DRIFT_WINDOW * 3)
+        assert stats.drifting() == []
+
+        with pytest.warns(Waits.LatencyDriftWarning):
+            record_all(stats, [0.5] * Waits.DRIFT_WINDOW)
+        assert stats.drifting() == [CONDITION]
+
+    def test_no_drift_without_history(self, stats):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            record_all(stats, [0.2] * Waits.DRIFT_WINDOW + [5.0] * (Waits.DRIFT_WINDOW - 1))
+        assert not stats.is_drifting(CONDITION)
+
+
+class TestAdaptiveWait(object):
+
+    def test_max_timeout_without_history(self, stats):
+        wait = Waits.AdaptiveWait(None, stats, MAX_TIMEOUT_SEC)
+        record_all(stats, [0.1] * (Waits.MIN_SAMPLES - 1))
+
+        assert wait.timeout(CONDITION) == MAX_TIMEOUT_SEC
+
+    def test_timeout_from_history(self, stats):
+        wait = Waits.AdaptiveWait(None, stats, MAX_TIMEOUT_SEC)
+        record_all(stats, [2.0] * Waits.MIN_SAMPLES)
+
+        assert wait.timeout(CONDITION) == pytest.approx(stats.percentile(CONDITION, 99) * Waits.TIMEOUT_MARGIN)
+        assert wait.timeout(CONDITION) < MAX_TIMEOUT_SEC
+
+    @pytest.mark.parametrize("max_timeout, expected", [(3, Waits.MIN_TIMEOUT_SEC), (10, 5)])
+    def test_timeout_floor(self, stats, max_timeout, expected):
+        wait = Waits.AdaptiveWait(None, stats, max_timeout)
+        record_all(stats, [0.05] * Waits.MIN_SAMPLES)
+
+        assert wait.timeout(CONDITION) == expected
+
+    def test_timeout_recovers(self, stats, clock):
+        driver = StubDriver(clock, ready_at=float("inf"))
+        wait = Waits.AdaptiveWait(driver, stats, MAX_TIMEOUT_SEC)
+        record_all(stats, [0.05] * Waits.MIN_SAMPLES)
+        adaptive_timeout = wait.timeout(CONDITION)
+
+        with pytest.raises(TimeoutException) as error:
+            wait.until(CONDITION, lambda stub: stub.is_ready())
+        assert clock.now == pytest.approx(adaptive_timeout)
+        assert f"within {adaptive_timeout:.1f} seconds" in error.value.msg
+        assert wait.timeout(CONDITION) == MAX_TIMEOUT_SEC
+
+        driver.ready_at = clock.now + 7
+        assert wait.until(CONDITION, lambda stub: stub.is_ready())
+        assert stats.consecutive_timeouts(CONDITION) == 0
+        # the timed out wait and the slow one are part of the history from now on
+        assert wait.timeout(CONDITION) > adaptive_timeout
+
+    def test_poll_intervals(self, stats):
+        wait = Waits.AdaptiveWait(None, stats, MAX_TIMEOUT_SEC)
+        record_all(stats, [0.4] * Waits.MIN_SAMPLES)
+        fast_until = stats.percentile(CONDITION, Waits.FAST_POLL_PERCENTILE)
+
+        intervals = list(itertools.islice(wait.poll_intervals(CONDITION), 30))
+        fast = list(itertools.takewhile(lambda interval: interval == Waits.MIN_POLL_SEC, intervals))
+
+        assert sum(fast) >= fast_until > sum(fast[:-1])
+        assert intervals[len(fast)] == Waits.MIN_POLL_SEC * Waits.POLL_BACKOFF
+        assert max(intervals) == intervals[-1] == Waits.MAX_POLL_SEC
+
+    def test_poll_backs_off_without_history(self, stats):
+        wait = Waits.AdaptiveWait(None, stats, MAX_TIMEOUT_SEC)
+
+        intervals = list(itertools.islice(wait.poll_intervals(CONDITION), 3))
+
+        assert intervals == [Waits.MIN_POLL_SEC, Waits.MIN_POLL_SEC * 2, Waits.MIN_POLL_SEC * 4]
+
+    def test_until_records_duration(self, stats, clock):
+        wait = Waits.AdaptiveWait(StubDriver(clock, ready_at=0.3), stats, MAX_TIMEOUT_SEC)
+
+        assert wait.until(CONDITION, lambda stub: stub.is_ready())
+        assert stats.samples(CONDITION) == 1
+        assert 0.3 <= stats.percentile(CONDITION, 50) < 0.3 * Waits.BUCKET_GROWTH ** 2